@@ -1,8 +1,12 @@
 import streamlit as st
 import os
-import importlib.util
-import inspect
-from tasks.utils import capture_output
+import time
+from tasks.executor import TaskRunError, get_executor
+from tasks.metrics import get_metrics
+from tasks.registry import get_registry
+from tasks.result_cache import get_result_cache
+from tasks.profiling import profiled
+from tasks.utils import BoundedOutput, build_task_args, redirect_output, stream_output
 import traceback # For detailed error tracebacks
 
 # --- Page Configuration (MUST BE THE FIRST STREAMLIT COMMAND) ---
@@ -13,72 +17,132 @@ st.set_page_config(page_title=APP_TITLE, page_icon=APP_ICON, layout="wide", init
 
 # --- Helper Functions (Keep as before) ---
 def load_tasks():
-    tasks = {}
+    """
+    Returns (tasks, load_stats). Modules are cached process-wide by the task registry,
+    so a rerun only re-executes task files that were actually edited.
+    """
     if not os.path.exists(TASK_DIR):
         st.error(f"Task directory '{TASK_DIR}' not found. Please create it and add task files.")
-        return tasks
-
-    task_files_raw = [f for f in os.listdir(TASK_DIR) if f.startswith("task_") and f.endswith(".py")]
-
-    def get_task_number(filename):
-        try:
-            # Extracts number after "task_" and before the next "_" or ".py"
-            num_str = filename.split('_')[1]
-            return int(num_str)
-        except (IndexError, ValueError):
-            return float('inf') # Put files with unparsable numbers at the end
-
-    task_files_sorted = sorted(task_files_raw, key=get_task_number)
-
-    for filename in task_files_sorted:
-        module_name = filename[:-3] # Remove .py
-        try:
-            task_number_str = module_name.split('_')[1]
-            task_number = int(task_number_str)
-        except (IndexError, ValueError):
-            st.warning(f"Could not parse task number from filename: '{filename}'. Skipping.")
-            continue
-
-        file_path = os.path.join(TASK_DIR, filename)
-        spec = importlib.util.spec_from_file_location(module_name, file_path)
-
-        if spec and spec.loader:
-            module = importlib.util.module_from_spec(spec)
-            try:
-                spec.loader.exec_module(module)
-            except Exception as e:
-                st.error(f"Error loading module {module_name}: {e}")
-                st.code(traceback.format_exc())
-                continue
-
-
-            if hasattr(module, "run_task") and callable(module.run_task):
-                docstring = inspect.getdoc(module) or "No description available."
-                first_line_doc = docstring.split('\n', 1)[0] # Get only the first line
-                task_title = first_line_doc
-                # Clean up common prefixes if they exist
-                task_title = task_title.replace(f"Task {task_number}: ", "").replace(f"Task {task_number_str}: ", "").strip()
-                if "Concept:" in task_title: # Further cleanup
-                    task_title = task_title.split("Concept:")[0].strip()
-                if not task_title : # Fallback if parsing fails
-                    task_title = module_name.replace("_", " ").title()
-
-
-                tasks[f"Task {task_number:02d}: {task_title}"] = {
-                    "module": module,
-                    "docstring": docstring,
-                    "source_code": inspect.getsource(module),
-                    "run_function": module.run_task,
-                    "get_input_params_function": getattr(module, "get_input_params", None)
-                }
-            else:
-                st.warning(f"Module '{module_name}' does not have a callable 'run_task' function. Skipping.")
+        return {}, None
+
+    tasks, messages, load_stats = get_registry(TASK_DIR, lazy=LAZY_TASK_DISCOVERY).load()
+    show_load_messages(messages)
+    return tasks, load_stats
+
+def show_load_messages(messages):
+    for level, text, details in messages:
+        if level == "error":
+            st.error(text)
+            if details:
+                st.code(details)
         else:
-            st.warning(f"Could not load module specification for '{filename}'. Skipping.")
-    return tasks
+            st.warning(text)
+
+def format_run_error(console, error, details):
+    # Keep whatever the task printed before it failed
+    error_message = console.getvalue()
+    if error_message:
+        error_message += "\n"
+    error_message += f"⚠️ An error occurred while running the task: {error}\n\n"
+    if details:
+        error_message += "Traceback:\n" + details
+    return error_message
+
+def execute_task(task_data, task_params):
+    """
+    Runs a task with the configured backend while showing its output live.
+    Returns (console_text, output); output is None if the run failed.
+    """
+    if EXECUTION_BACKEND == "process":
+        # Runs in a worker process: a slow or looping task can't block this session's script thread
+        output_chunks = get_executor(TASK_DIR).stream(task_data["file_name"], task_params, timeout=TASK_TIMEOUT_SECONDS)
+    else:
+        output_chunks = stream_output(task_data["run_function"], **task_params)
+
+    live_console = st.empty() # Shows output while the task is still running
+    console = BoundedOutput.from_limits(task_data["output_limits"]) # Caps what this session keeps in memory
+    last_refresh = 0.0
+    try:
+        for chunk in output_chunks:
+            console.write(chunk)
+            if time.perf_counter() - last_refresh >= LIVE_OUTPUT_REFRESH_SECONDS:
+                last_refresh = time.perf_counter()
+                live_console.code(console.tail_text(LIVE_OUTPUT_TAIL_CHARS), language=None)
+        output = console.getvalue()
+        return (output if output else "✅ Task executed successfully with no print output."), output
+    except TaskRunError as e:
+        return format_run_error(console, e.result["error"], e.result["traceback"]), None
+    except Exception as e:
+        return format_run_error(console, f"{type(e).__name__} - {e}", traceback.format_exc()), None
+    finally:
+        live_console.empty()
+
+def execute_task_profiled(task_data, task_params):
+    """
+    Runs a task under cProfile + tracemalloc (no live output).
+    Returns (console_text, output, profile_report); output is None if the run failed
+    and the report is None if the task never started.
+    """
+    if EXECUTION_BACKEND == "process":
+        result = get_executor(TASK_DIR).run(task_data["file_name"], task_params, timeout=TASK_TIMEOUT_SECONDS, profile_top_n=PROFILE_TOP_N)
+        console = BoundedOutput.from_limits(task_data["output_limits"])
+        console.write(result["output"])
+        if result["error"]:
+            return format_run_error(console, result["error"], result["traceback"]), None, result["profile"]
+        return (result["output"] if result["output"] else "✅ Task executed successfully with no print output."), result["output"], result["profile"]
+
+    report = None
+    console = BoundedOutput.from_limits(task_data["output_limits"]) # Keeps what was printed before a failure
+    try:
+        with redirect_output(console), profiled(PROFILE_TOP_N) as report:
+            task_data["run_function"](**task_params)
+        output = console.getvalue()
+        return (output if output else "✅ Task executed successfully with no print output."), output, report
+    except Exception as e:
+        return format_run_error(console, f"{type(e).__name__} - {e}", traceback.format_exc()), None, report
+
+def show_profile_report(report, file_stem):
+    st.markdown("**🔬 Profile of the last run**")
+    st.metric("Peak traced memory", f"{report['peak_bytes'] / 1024:,.1f} KiB")
+    st.download_button("💾 Download .pstats", data=report["pstats"], file_name=f"{file_stem}.pstats",
+                       mime="application/octet-stream", key=f"pstats_download_{file_stem}")
+    with st.expander(f"Top {PROFILE_TOP_N} functions by cumulative time", expanded=True):
+        st.code(report["top_functions"], language=None)
+    with st.expander("Top allocation sites (still allocated at the end)"):
+        st.table([
+            {"location": site["location"], "KiB": round(site["size_bytes"] / 1024, 1), "blocks": site["count"]}
+            for site in report["top_allocations"]
+        ])
+
+def import_selected_task(task_data):
+    """
+    Makes sure the selected task's module is executed (lazy discovery only reads the AST).
+    Returns True if the task is ready to be used.
+    """
+    messages = get_registry(TASK_DIR, lazy=LAZY_TASK_DISCOVERY).import_task(task_data)
+    show_load_messages(messages)
+    return not messages
 
 # --- Global Constants & Styling ---
 TASK_DIR = "tasks" # Define TASK_DIR here to be accessible by load_tasks
+LAZY_TASK_DISCOVERY = True # Build the sidebar from each file's AST; import a task only when it is selected
+EXECUTION_BACKEND = "process" # "process": shared worker pool (tasks.executor), "inline": this script thread
+TASK_TIMEOUT_SECONDS = 30 # Wall-clock limit per run in the "process" backend
+LIVE_OUTPUT_REFRESH_SECONDS = 0.1 # Minimum delay between live console redraws while a task runs
+LIVE_OUTPUT_TAIL_CHARS = 20_000 # The live console only redraws the end of the output
+PROFILE_TOP_N = 20 # Rows shown in the profiling panel (functions and allocation sites)
+METRICS_FILE = os.environ.get("OOP_LAB_METRICS_FILE") # Prometheus text file rewritten after every rerun
+METRICS_PORT = os.environ.get("OOP_LAB_METRICS_PORT") # Serve the metrics on http://127.0.0.1:<port>/metrics
+
+metrics = get_metrics() # Process-wide: phase timings of every session end up in one set of histograms
+if METRICS_PORT:
+    if not (METRICS_PORT.strip().isdigit() and 0 < int(METRICS_PORT) < 65536):
+        st.sidebar.warning(f"Metrics endpoint not started: OOP_LAB_METRICS_PORT must be a port number (1-65535), not {METRICS_PORT!r}.")
+    else:
+        try:
+            metrics.start_http_server(int(METRICS_PORT))
+        except OSError as e:
+            st.sidebar.warning(f"Metrics endpoint not started on port {METRICS_PORT}: {e}")
 
 # Custom CSS for minor styling (optional)
 # You can add more specific CSS if needed, but keep it minimal for maintainability
@@ -138,7 +202,8 @@ st.sidebar.markdown(f"<p class='sidebar-title'>{APP_ICON} {APP_TITLE}</p>", unsa
 st.sidebar.markdown("---") # Visual separator
 
 st.sidebar.header("🎯 OOP Concepts") # "Choose OOP Concepts"
-all_tasks = load_tasks() # Load tasks after defining TASK_DIR
+with metrics.time_phase("load"):
+    all_tasks, task_load_stats = load_tasks() # Load tasks after defining TASK_DIR
 
 if not all_tasks:
     st.error(f"No valid tasks found. Please check the '{TASK_DIR}' directory for Python files named 'task_XX_concept.py' each containing a 'run_task' function.")
@@ -158,12 +223,19 @@ else:
 
     # Display total tasks
     st.sidebar.info(f"Total Tasks: {len(all_tasks)}")
+    if task_load_stats:
+        st.sidebar.caption(
+            f"Task cache: {task_load_stats['hits']} hits, {task_load_stats['rebuilds']} rebuilds, "
+            f"{task_load_stats['reload_ms']:.1f} ms this rerun"
+        )
 
 
     # Main Content Area
-    if selected_task_name and selected_task_name in all_tasks:
+    if selected_task_name and selected_task_name in all_tasks and import_selected_task(all_tasks[selected_task_name]):
         task_data = all_tasks[selected_task_name]
         task_short_name = selected_task_name.split(':')[0]
+        task_label = task_data["file_name"][:-3] # Metrics label: stable even if the docstring title changes
+        metrics.set_task_slos(task_label, task_data["latency_slo"])
         form_key = f"{task_short_name}_input_form" # Unique key for the form
 
         st.header(f"🧑‍🏫 {selected_task_name}") # Task title with an icon
@@ -182,12 +254,15 @@ else:
 
 
         # --- Inputs Section ---
+        form_start = time.perf_counter()
         st.subheader("⚙️ Provide Your Inputs (if any)")
         user_inputs = {} # This will hold the current values from widgets
         input_params_defined = False
 
-        if task_data["get_input_params_function"]:
-            params_to_get = task_data["get_input_params_function"]()
+        if task_data["has_input_params"]:
+            params_to_get = task_data["input_params"] # Parsed statically when get_input_params() returns a literal
+            if params_to_get is None:
+                params_to_get = task_data["get_input_params_function"]()
             if params_to_get:
                 input_params_defined = True
                 # The st.form helps group inputs and submit them together
@@ -254,6 +329,7 @@ else:
         else:
             st.info("This task runs with a predefined example and does not require user inputs.")
         st.markdown("---")
+        metrics.observe("form", task_label, time.perf_counter() - form_start)
 
 
         # --- Execution Section ---
@@ -269,29 +345,76 @@ else:
         if output_text_key not in st.session_state:
             st.session_state[output_text_key] = "Click 'Run Task' to see the output."
 
-        if st.button(run_button_label, key=f"run_button_{task_short_name}"):
-            with st.spinner("🧠 Processing task..."):
-                current_args_for_task = {}
-                sig = inspect.signature(task_data["run_function"])
-                default_args = {
-                    k: v.default for k, v in sig.parameters.items()
-                    if v.default is not inspect.Parameter.empty
-                }
-                current_args_for_task.update(default_args)
-                current_args_for_task.update(final_inputs_to_use) # User inputs override defaults
-
-                try:
-                    # Filter current_args_for_task to only include actual parameters of run_function
-                    valid_task_params = {k: v for k, v in current_args_for_task.items() if k in sig.parameters}
-                    output = capture_output(task_data["run_function"], **valid_task_params)
-                    st.session_state[output_text_key] = output if output else "✅ Task executed successfully with no print output."
-                except Exception as e:
-                    error_message = f"⚠️ An error occurred while running the task: {type(e).__name__} - {e}\n\n"
-                    error_message += "Traceback:\n" + traceback.format_exc()
-                    st.session_state[output_text_key] = error_message
-
-        st.text_area("🖥️ Output Console:", value=st.session_state[output_text_key], height=350, key=f"output_display_{selected_task_name}")
+        run_col, options_col = st.columns([3, 2])
+        with options_col:
+            use_result_cache = st.checkbox(
+                "♻️ Reuse cached output", value=False, key=f"use_cache_{task_short_name}",
+                disabled=not task_data["cacheable"],
+                help="Serve identical runs (same task code, same inputs) from a shared cache." if task_data["cacheable"]
+                     else "This task's output depends on earlier runs, so it is never cached."
+            )
+            profile_run = st.checkbox(
+                "🔬 Profile this run", value=False, key=f"profile_run_{task_short_name}",
+                help="Run under cProfile + tracemalloc and show where time and memory go. Output is shown when the run ends."
+            )
+        with run_col:
+            run_clicked = st.button(run_button_label, key=f"run_button_{task_short_name}")
+
+        profile_key = f"profile_report_{selected_task_name}"
+
+        if run_clicked:
+            run_start = time.perf_counter()
+            valid_task_params = build_task_args(task_data["run_function"], final_inputs_to_use)
+
+            result_cache = get_result_cache()
+            cache_key = None
+            cached_output = None
+            if use_result_cache and task_data["cacheable"] and not profile_run:
+                cache_key = result_cache.make_key(task_data["source_hash"], valid_task_params)
+                cached_output = result_cache.get(cache_key)
+
+            st.session_state[profile_key] = None # A report only describes the run it came from
+            if profile_run: # Always executes: a cached result has nothing to profile
+                with st.spinner("🔬 Profiling task..."):
+                    console_text, output, st.session_state[profile_key] = execute_task_profiled(task_data, valid_task_params)
+                st.session_state[output_text_key] = console_text
+            elif cached_output is not None:
+                output = cached_output
+                st.session_state[output_text_key] = cached_output if cached_output else "✅ Task executed successfully with no print output."
+                metrics.inc("cache_hits", task_label)
+                cache_stats = result_cache.stats()
+                st.caption(f"♻️ Served from cache ({cache_stats['hits']} hits / {cache_stats['misses']} misses so far).")
+            else:
+                with st.spinner("🧠 Processing task..."):
+                    console_text, output = execute_task(task_data, valid_task_params)
+                st.session_state[output_text_key] = console_text
+                if output is not None and cache_key is not None:
+                    result_cache.put(cache_key, output) # Only successful runs are cached
+
+            run_seconds = time.perf_counter() - run_start
+            metrics.inc("runs", task_label)
+            metrics.inc("output_bytes", task_label, len(st.session_state[output_text_key].encode("utf-8")))
+            if output is None:
+                metrics.inc("errors", task_label)
+            # A cache hit never ran the task: timed as its own phase so it can't skew "execute" or its SLO
+            if metrics.observe("cache_hit" if cached_output is not None else "execute", task_label, run_seconds):
+                st.caption(f"⏱️ This run took {run_seconds:.2f} s, over the task's latency SLO.")
+
+        render_start = time.perf_counter()
+        profile_report = st.session_state.get(profile_key)
+        if profile_report:
+            console_col, profile_col = st.columns([3, 2])
+            with profile_col:
+                show_profile_report(profile_report, task_data["file_name"][:-3])
+        else:
+            console_col = st.container()
+        with console_col:
+            st.text_area("🖥️ Output Console:", value=st.session_state[output_text_key], height=350, key=f"output_display_{selected_task_name}")
+        metrics.observe("render", task_label, time.perf_counter() - render_start)
 
 # Sidebar Footer
 st.sidebar.markdown("---")
-st.sidebar.markdown("<p class='sidebar-footer'>Created with Python & Streamlit by Taha ❤️ </p>", unsafe_allow_html=True)
\ No newline at end of file
+st.sidebar.markdown("<p class='sidebar-footer'>Created with Python & Streamlit by Taha ❤️ </p>", unsafe_allow_html=True)
+
+if METRICS_FILE:
+    metrics.write_textfile(METRICS_FILE)
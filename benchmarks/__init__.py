@@ -0,0 +1,128 @@
+"""
+Micro-benchmarks for the hot methods of the task classes.
+
+    python -m benchmarks                        # default sizes, prints silenced
+    python -m benchmarks --sizes 10,1000,1000000 -k playlist
+    python -m benchmarks --print-mode both      # also measure what print() costs
+    python -m benchmarks --save                 # write benchmarks/baseline.json
+    python -m benchmarks --threshold 0.25       # exit 1 if >25% slower than the baseline
+
+A benchmark is a function registered with @benchmark(name). It receives the input
+size n and returns (run, ops): `run` is the zero-argument callable that gets timed and
+`ops` the number of operations it performs. Everything before `return` is untimed setup,
+and the function is called again for every timed run, so `run` may mutate freely.
+"""
+import importlib.util
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+from benchmarks import baselines
+from tasks.registry import TaskRegistry, get_task_number
+from tasks.utils import redirect_output
+
+TASK_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tasks")
+DEFAULT_SIZES = (10, 1_000, 100_000)
+PRINT_MODES = ("silent", "devnull")
+MIN_SAMPLE_SECONDS = 0.02 # Tiny sizes are re-run until one sample takes at least this long
+PER_SIZE_OPS = 100 # Operations whose cost grows with the collection run this many times on a size-n collection
+
+BENCHMARKS = {} # name -> {"func", "max_size", "group"}
+
+
+def benchmark(name, max_size=None, requires=()):
+    """
+    Registers a benchmark. Sizes above max_size are skipped (for deliberately slow baselines),
+    and so is the whole benchmark when a module named in `requires` (e.g. "numpy") isn't installed.
+    """
+    def register(func):
+        BENCHMARKS[name] = {"func": func, "max_size": max_size, "requires": tuple(requires),
+                            "group": func.__module__.rsplit(".", 1)[-1]}
+        return func
+    return register
+
+
+def missing_modules(name):
+    return [module for module in BENCHMARKS[name]["requires"] if importlib.util.find_spec(module) is None]
+
+
+_task_modules = {}
+
+def task_module(number):
+    """
+    Returns the imported module of task `number`, loaded once through the task registry.
+    """
+    if not _task_modules:
+        tasks, _, _ = TaskRegistry(TASK_DIR).load()
+        for task_data in tasks.values():
+            _task_modules[get_task_number(task_data["file_name"])] = task_data["module"]
+    return _task_modules[number]
+
+
+def _silent_print(*args, **kwargs):
+    pass
+
+class _NullSink:
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+@contextmanager
+def print_mode(mode):
+    """
+    "silent": task modules' print() becomes a no-op, so only the logic is timed
+    (f-string arguments are still built). "devnull": print() runs for real into a null sink.
+    """
+    task_module(1) # Make sure every task module is loaded before patching
+    if mode == "silent":
+        # Modules already silenced by an enclosing print_mode("silent") are left to it
+        modules = [module for module in list(_task_modules.values()) + [baselines] if "print" not in vars(module)]
+        for module in modules:
+            module.print = _silent_print # Module globals shadow the builtin
+        try:
+            yield
+        finally:
+            for module in modules:
+                del module.print
+    elif mode == "devnull":
+        with redirect_output(_NullSink()):
+            yield
+    else:
+        raise ValueError(f"Unknown print mode '{mode}'. Use one of {PRINT_MODES}.")
+
+
+def _sample(func, size):
+    # One timed sample; repeats the benchmark until it lasts MIN_SAMPLE_SECONDS
+    elapsed, ops = 0.0, 0
+    while elapsed < MIN_SAMPLE_SECONDS:
+        run, run_ops = func(size)
+        start = time.perf_counter()
+        run()
+        elapsed += time.perf_counter() - start
+        ops += run_ops
+    return elapsed / ops
+
+
+def run_benchmark(name, size, repeat=5, mode="silent"):
+    """
+    Times one benchmark at one size. Returns a result dict with best/median seconds per op.
+    """
+    spec = BENCHMARKS[name]
+    with print_mode(mode):
+        per_op = [_sample(spec["func"], size) for _ in range(repeat)]
+    return {
+        "name": name,
+        "group": spec["group"],
+        "size": size,
+        "print_mode": mode,
+        "repeat": repeat,
+        "best_s_per_op": min(per_op),
+        "median_s_per_op": statistics.median(per_op),
+    }
+
+
+def result_key(result):
+    return f"{result['name']}[n={result['size']},{result['print_mode']}]"
@@ -0,0 +1,106 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+
+from benchmarks import BENCHMARKS, DEFAULT_SIZES, PRINT_MODES, missing_modules, result_key, run_benchmark
+from benchmarks import money, objects, playlist, transfers, words # noqa: F401  (registers the benchmarks)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def compare(results, baseline, threshold):
+    """
+    Returns [(key, ratio)] for results slower than (1 + threshold) x their baseline.
+    """
+    regressions = []
+    for result in results:
+        previous = baseline.get("results", {}).get(result_key(result))
+        if previous:
+            ratio = result["best_s_per_op"] / previous["best_s_per_op"]
+            result["vs_baseline"] = ratio
+            if ratio > 1 + threshold:
+                regressions.append((result_key(result), ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark the task classes' hot methods.")
+    parser.add_argument("-k", "--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help=f"Comma-separated input sizes, e.g. 10 to 10000000 (default: {','.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed samples per benchmark and size (default: 5)")
+    parser.add_argument("--print-mode", choices=PRINT_MODES + ("both",), default="silent",
+                        help="silent: print() is a no-op; devnull: print() writes to a null sink; both: report print cost")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file to compare against / save to")
+    parser.add_argument("--save", action="store_true", help="Write these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown vs baseline, 0.25 = 25%% (default)")
+    parser.add_argument("--json", default=None, help="Also write the raw results to this file")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    modes = PRINT_MODES if args.print_mode == "both" else (args.print_mode,)
+    names = [name for name in BENCHMARKS if args.filter in name]
+    if not names:
+        parser.error(f"No benchmark matches '{args.filter}'.")
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = []
+    print(f"{'benchmark':<42}{'n':>10}{'mode':>9}{'ns/op':>14}{'vs base':>10}")
+    for name in names:
+        missing = missing_modules(name)
+        if missing:
+            print(f"{name:<42}  skipped: needs {', '.join(missing)}")
+            continue
+        max_size = BENCHMARKS[name]["max_size"]
+        for size in sizes:
+            if max_size is not None and size > max_size:
+                continue
+            for mode in modes:
+                result = run_benchmark(name, size, repeat=args.repeat, mode=mode)
+                results.append(result)
+                compare([result], baseline, args.threshold)
+                ratio = f"{result['vs_baseline']:.2f}x" if "vs_baseline" in result else "-"
+                print(f"{name:<42}{size:>10}{mode:>9}{result['best_s_per_op'] * 1e9:>14,.0f}{ratio:>10}", flush=True)
+
+    if args.print_mode == "both":
+        print("\nprint() cost (devnull - silent):")
+        by_key = {(r["name"], r["size"], r["print_mode"]): r for r in results}
+        for (name, size, mode), result in by_key.items():
+            if mode == "devnull" and (name, size, "silent") in by_key:
+                silent = by_key[(name, size, "silent")]["best_s_per_op"]
+                share = 1 - silent / result["best_s_per_op"] if result["best_s_per_op"] else 0.0
+                print(f"  {name:<40}{size:>10}{(result['best_s_per_op'] - silent) * 1e9:>14,.0f} ns/op ({share:.0%} of the call)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save:
+        saved = {
+            "meta": {"created": datetime.datetime.now().isoformat(timespec="seconds"),
+                     "python": platform.python_version(), "machine": platform.platform()},
+            "results": {result_key(result): result for result in results},
+        }
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(saved, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}:", file=sys.stderr)
+        for key, ratio in regressions:
+            print(f"  {key}: {ratio:.2f}x baseline", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
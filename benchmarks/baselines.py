@@ -0,0 +1,113 @@
+"""
+Earlier implementations of task classes, kept unchanged so benchmarks can compare against them.
+print_mode() silences this module's print() the same way it silences the task modules.
+"""
+
+
+class ListSong:
+    def __init__(self, title, artist):
+        self.title = title
+        self.artist = artist
+    def __str__(self):
+        return f"'{self.title}' by {self.artist}"
+
+class ListPlaylist:
+    # task_04 Playlist before the title index: a plain list, scanned on every removal
+    def __init__(self, playlist_name):
+        self.name = playlist_name
+        self.songs = []
+        print(f"Playlist '{self.name}' created.")
+
+    def add_song(self, title, artist):
+        new_song = ListSong(title, artist)
+        self.songs.append(new_song)
+        print(f"Added {new_song} to '{self.name}'.")
+
+    def remove_song(self, title_to_remove):
+        song_found = None
+        for song in self.songs:
+            if song.title.lower() == title_to_remove.lower():
+                song_found = song
+                break
+        if song_found:
+            self.songs.remove(song_found)
+            print(f"Removed '{song_found.title}' from '{self.name}'.")
+        else:
+            print(f"Song '{title_to_remove}' not found in '{self.name}'.")
+
+
+def choices_draw(songs, weight_by, rng):
+    # Weighted pick the obvious way: rebuild the weight list over every song, per draw
+    weights = [song.rating if weight_by == "rating" else song.play_count + 1 for song in songs]
+    return rng.choices(songs, weights=weights)[0]
+
+
+class StringLogBankAccount:
+    # task_12 BankAccount before the columnar ledger: float balance, one f-string per transaction
+    def __init__(self, account_holder, initial_balance=0):
+        self.account_holder = account_holder
+        self._balance = float(initial_balance)
+        self.__transaction_id_counter = 0
+        self.__transaction_log = []
+        print(f"Account for {self.account_holder} created with balance: ${self._balance:.2f}")
+
+    def _generate_transaction_id(self):
+        self.__transaction_id_counter += 1
+        return f"TXN{self.__transaction_id_counter:04d}"
+
+    def deposit(self, amount):
+        amount = float(amount)
+        if amount > 0:
+            self._balance += amount
+            txn_id = self._generate_transaction_id()
+            self.__transaction_log.append(f"{txn_id}: Deposited ${amount:.2f}")
+            print(f"Deposited ${amount:.2f}. New balance: ${self._balance:.2f}")
+        else:
+            print("Deposit amount must be positive.")
+
+    def withdraw(self, amount):
+        amount = float(amount)
+        if 0 < amount <= self._balance:
+            self._balance -= amount
+            txn_id = self._generate_transaction_id()
+            self.__transaction_log.append(f"{txn_id}: Withdrew ${amount:.2f}")
+            print(f"Withdrew ${amount:.2f}. New balance: ${self._balance:.2f}")
+        elif amount > self._balance:
+            print(f"Insufficient funds. Cannot withdraw ${amount:.2f} from ${self._balance:.2f}.")
+        else:
+            print("Withdrawal amount must be positive.")
+
+
+class ListWordCollection:
+    # task_18 WordCollection before the blocked sorted list: scan + full sort on every insert
+    def __init__(self, initial_words_str=""):
+        raw_words = [word.strip().lower() for word in initial_words_str.split(',') if word.strip()]
+        self._words = sorted(list(set(raw_words)))
+        print(f"WordCollection created with words: {self._words}")
+
+    def add_word(self, new_word):
+        new_word_clean = new_word.strip().lower()
+        if new_word_clean and new_word_clean not in self._words:
+            self._words.append(new_word_clean)
+            self._words.sort()
+            print(f"Added '{new_word_clean}'. Collection: {self._words}")
+        elif not new_word_clean:
+            print("Cannot add empty word.")
+        else:
+            print(f"Word '{new_word_clean}' already in collection.")
+
+    def __len__(self):
+        print("WordCollection.__len__ called.")
+        return len(self._words)
+
+    def __getitem__(self, key):
+        print(f"WordCollection.__getitem__ called with key: {key} (type: {type(key)})")
+        return self._words[key]
+
+
+def scan_prefix(words, prefix):
+    # Autocomplete the obvious way: test every word of the sorted list
+    return [word for word in words if word.startswith(prefix)]
+
+def scan_count_between(words, low, high):
+    return sum(1 for word in words if low <= word <= high)
@@ -0,0 +1,277 @@
+"""
+Task 19: Currency, Task 12: BankAccount. bankaccount_strlog.* time the original string-log BankAccount.
+currencyarray.* need NumPy and are skipped without it; compare them with currency.* at the same n.
+"""
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+from benchmarks import PER_SIZE_OPS, baselines, benchmark, print_mode, task_module
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@benchmark("currency.__add__")
+def currency_add(n):
+    Currency = task_module(19).Currency
+    total, step = Currency(0, "USD"), Currency(1.25, "USD")
+
+    def run():
+        running = total
+        for _ in range(n):
+            running = running + step
+    return run, n
+
+
+@benchmark("currency.__mul__")
+def currency_mul(n):
+    price = task_module(19).Currency(19.99, "EUR")
+
+    def run():
+        for i in range(n):
+            price * (i % 10)
+    return run, n
+
+
+@benchmark("currency.sum", max_size=1_000_000)
+def currency_sum(n):
+    # Summing n amounts one Currency at a time: the baseline for currencyarray.sum
+    Currency = task_module(19).Currency
+    amounts = [Currency(1.25 + i % 100, "USD") for i in range(n)]
+
+    def run():
+        total = Currency(0, "USD")
+        for amount in amounts:
+            total = total + amount
+    return run, n
+
+
+_currency_arrays = {}
+
+def shared_currency_array(n, units=("USD",)):
+    # Built once per size and units (ops never modify an array): the string unit column is slow to build
+    if (n, units) not in _currency_arrays:
+        amounts = (np.arange(n) % 10_000 + 125) / 100
+        unit = units[0] if len(units) == 1 else np.resize(np.array(units), n)
+        with print_mode("silent"):
+            _currency_arrays[(n, units)] = task_module(19).CurrencyArray(amounts, unit)
+    return _currency_arrays[(n, units)]
+
+
+@benchmark("currencyarray.__add__", requires=("numpy",))
+def currencyarray_add(n):
+    a = b = shared_currency_array(n)
+    return (lambda: a + b), n
+
+
+@benchmark("currencyarray.__add__mixed", requires=("numpy",))
+def currencyarray_add_mixed(n):
+    # Per-element unit codes: the unit check is one vectorized comparison
+    a = b = shared_currency_array(n, ("USD", "EUR", "GBP"))
+    return (lambda: a + b), n
+
+
+@benchmark("currencyarray.__mul__", requires=("numpy",))
+def currencyarray_mul(n):
+    a = shared_currency_array(n)
+    return (lambda: a * 1.5), n
+
+
+@benchmark("currencyarray.__eq__", requires=("numpy",))
+def currencyarray_eq(n):
+    a = b = shared_currency_array(n)
+    return (lambda: a == b), n
+
+
+@benchmark("currencyarray.sum", requires=("numpy",))
+def currencyarray_sum(n):
+    a = shared_currency_array(n)
+    return a.sum, n
+
+
+def _deposit(account_class, n):
+    account = account_class("Bench", 0)
+
+    def run():
+        for i in range(n):
+            account.deposit(10 + i % 50)
+    return run, n
+
+def _withdraw(account_class, n):
+    account = account_class("Bench", 100 * n)
+
+    def run():
+        for i in range(n):
+            account.withdraw(1 + i % 50)
+    return run, n
+
+
+@benchmark("bankaccount.deposit")
+def bankaccount_deposit(n):
+    return _deposit(task_module(12).BankAccount, n)
+
+@benchmark("bankaccount_strlog.deposit")
+def bankaccount_strlog_deposit(n):
+    return _deposit(baselines.StringLogBankAccount, n)
+
+
+@benchmark("bankaccount.withdraw")
+def bankaccount_withdraw(n):
+    return _withdraw(task_module(12).BankAccount, n)
+
+@benchmark("bankaccount_strlog.withdraw")
+def bankaccount_strlog_withdraw(n):
+    return _withdraw(baselines.StringLogBankAccount, n)
+
+
+@benchmark("bankaccount.deposit_many")
+def bankaccount_deposit_many(n):
+    account = task_module(12).BankAccount("Bench", 0)
+    amounts = [10 + i % 50 for i in range(n)]
+
+    def run():
+        account.deposit_many(amounts)
+    return run, n
+
+
+@benchmark("bankaccount.withdraw_many")
+def bankaccount_withdraw_many(n):
+    account = task_module(12).BankAccount("Bench", 100 * n)
+    amounts = [1 + i % 50 for i in range(n)]
+
+    def run():
+        account.withdraw_many(amounts)
+    return run, n
+
+
+_wal_dir = None
+
+def wal_path(name):
+    # Logs live in one temporary directory, removed when the benchmarks exit
+    global _wal_dir
+    if _wal_dir is None:
+        _wal_dir = tempfile.mkdtemp(prefix="oop-lab-wal-")
+        atexit.register(shutil.rmtree, _wal_dir, True)
+    return os.path.join(_wal_dir, name)
+
+
+@benchmark("bankaccount.deposit_wal")
+def bankaccount_deposit_wal(n):
+    # deposit() on a persistent account: ledger + log record + a group commit every 64
+    account = task_module(12).BankAccount("Bench", 0, wal_path=wal_path(f"deposit-{n}.wal"))
+
+    def run():
+        for i in range(n):
+            account.deposit(10 + i % 50)
+        account.sync()
+    return run, n
+
+
+_replay_logs = {}
+
+@benchmark("bankaccount.replay")
+def bankaccount_replay(n):
+    # Recovering an account from an n-record log (no snapshot)
+    if n not in _replay_logs:
+        path = _replay_logs[n] = wal_path(f"replay-{n}.wal")
+        account = task_module(12).BankAccount("Bench", 0, wal_path=path, snapshot_every=n + 1)
+        account.deposit_many([10 + i % 50 for i in range(n)])
+        account.close()
+
+    def run():
+        task_module(12).BankAccount("Bench", wal_path=_replay_logs[n]).close()
+    return run, n
+
+
+_history_accounts = {}
+
+def history_account(n):
+    # Built once per size with n mixed deposits and withdrawals; the query runs only read it.
+    # The amount indexes are built just before the last few transactions, so the queries also scan
+    # a non-empty unsorted tail, as they would on a live account.
+    if n not in _history_accounts:
+        module = task_module(12)
+        with print_mode("silent"):
+            account = module.BankAccount("Bench", 0)
+            for start in range(0, n, 1000):
+                account.deposit_many([10 + (i * 7919) % 5000 for i in range(start, start + 500)])
+                account.withdraw_many([1 + (i * 104729) % 400 for i in range(start, start + 500)])
+            account.largest_transactions(1) # Builds the amount indexes outside the timed runs
+            tail = range(module.AmountIndex.TAIL // 2)
+            account.deposit_many([10 + (i * 7919) % 5000 for i in tail])
+            account.withdraw_many([1 + (i * 104729) % 400 for i in tail])
+        account.largest_transactions(1) # Too few to become a sorted run: they stay in the tails
+        _history_accounts[n] = account
+    return _history_accounts[n]
+
+
+@benchmark("bankaccount.balance_as_of")
+def bankaccount_balance_as_of(n):
+    account = history_account(n)
+    txn_ids = range(1, n + 1, max(1, n // PER_SIZE_OPS))
+
+    def run():
+        for txn_id in txn_ids:
+            account.balance_as_of(txn_id)
+    return run, len(txn_ids)
+
+
+@benchmark("bankaccount.transactions_between_ids")
+def bankaccount_transactions_between_ids(n):
+    # 10-transaction windows spread over the whole history
+    account = history_account(n)
+    starts = range(1, n + 1, max(1, n // PER_SIZE_OPS))
+
+    def run():
+        for start in starts:
+            account.transactions_between_ids(start, start + 9)
+    return run, len(starts)
+
+
+@benchmark("bankaccount.withdrawals_above")
+def bankaccount_withdrawals_above(n):
+    # The ~10 largest withdrawals: cost should follow the answer, not the history
+    account = history_account(n)
+    threshold = 400 - 400 * 10 // max(n // 2, 1)
+
+    def run():
+        for _ in range(PER_SIZE_OPS):
+            account.withdrawals_above(threshold)
+    return run, PER_SIZE_OPS
+
+
+@benchmark("bankaccount.largest_transactions")
+def bankaccount_largest_transactions(n):
+    account = history_account(n)
+
+    def run():
+        for _ in range(PER_SIZE_OPS):
+            account.largest_transactions(10)
+    return run, PER_SIZE_OPS
+
+
+def bytes_per_transaction(account_class, n):
+    # Traced memory added by n deposits, divided by n
+    with print_mode("silent"):
+        account = account_class("Bench", 0)
+    tracemalloc.start()
+    try:
+        with print_mode("silent"):
+            for i in range(n):
+                account.deposit(10 + i % 50)
+        return tracemalloc.get_traced_memory()[0] / n
+    finally:
+        tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    # python -m benchmarks.money [n]: memory per logged transaction, columnar ledger vs string log
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    for label, account_class in (("BankAccount", task_module(12).BankAccount), ("StringLogBankAccount", baselines.StringLogBankAccount)):
+        print(f"{label:<22}{bytes_per_transaction(account_class, size):>8.1f} bytes/transaction at n={size:,}")
@@ -0,0 +1,80 @@
+"""
+Constructors and simple methods: Character (01), Robot (02), Book (03),
+Rectangle (10 and 13), Student / Course (21).
+"""
+from benchmarks import PER_SIZE_OPS, benchmark, task_module
+
+
+@benchmark("character.__init__")
+def character_init(n):
+    Character = task_module(1).Character
+
+    def run():
+        for i in range(n):
+            Character(f"Hero {i}", "Wizard", i % 99 + 1)
+    return run, n
+
+
+@benchmark("robot.__init__")
+def robot_init(n):
+    Robot = task_module(2).Robot
+
+    def run():
+        for i in range(n):
+            Robot(f"R{i}", i % 100, "Repair")
+    return run, n
+
+
+@benchmark("book.__init__")
+def book_init(n):
+    Book = task_module(3).Book
+
+    def run():
+        for i in range(n):
+            Book(f"Volume {i}", "A. Coder", 100 + i % 900, "Educational")
+    return run, n
+
+
+@benchmark("student.__init__")
+def student_init(n):
+    Student = task_module(21).Student
+
+    def run():
+        for i in range(n):
+            Student(f"S{i:07d}", f"Student {i}", "CS", 3.0)
+    return run, n
+
+
+@benchmark("course.add_student")
+def course_add_student(n):
+    module = task_module(21)
+    course = module.Course("CS101", "Intro", 4)
+    for i in range(n):
+        course.enrolled_students.append(module.Student(f"S{i:07d}", f"Student {i}", "CS", 3.0))
+    ops = min(n, PER_SIZE_OPS)
+    newcomers = [module.Student(f"N{i:07d}", f"New {i}", "Math", 3.5) for i in range(ops)]
+
+    def run():
+        for student in newcomers:
+            course.add_student(student)
+    return run, ops
+
+
+@benchmark("rectangle.area (method, task 10)")
+def rectangle_area_method(n):
+    rectangle = task_module(10).Rectangle(3, 4)
+
+    def run():
+        for _ in range(n):
+            rectangle.area()
+    return run, n
+
+
+@benchmark("rectangle.area (property, task 13)")
+def rectangle_area_property(n):
+    rectangle = task_module(13).Rectangle(3, 4)
+
+    def run():
+        for _ in range(n):
+            rectangle.area
+    return run, n
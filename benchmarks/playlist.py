@@ -0,0 +1,209 @@
+"""
+Task 04: Playlist / Song. The playlist_list.* cases time the original list-backed Playlist.
+"""
+import random
+import sys
+import tracemalloc
+from itertools import islice
+
+from benchmarks import PER_SIZE_OPS, baselines, benchmark, print_mode, task_module
+
+
+def make_playlist(n, playlist_class=None):
+    playlist = (playlist_class or task_module(4).Playlist)("Bench Mix")
+    for i in range(n):
+        playlist.add_song(f"Song {i}", f"Artist {i % 1000}")
+    return playlist
+
+
+_shared_playlists = {}
+
+def shared_playlist(n, playlist_class=None):
+    # Built once per size: runs that use it must leave it as they found it
+    playlist_class = playlist_class or task_module(4).Playlist
+    if (playlist_class, n) not in _shared_playlists:
+        _shared_playlists[(playlist_class, n)] = make_playlist(n, playlist_class)
+    return _shared_playlists[(playlist_class, n)]
+
+
+def _add_song(playlist_class, n):
+    playlist = playlist_class("Bench Mix")
+    titles = [(f"Song {i}", f"Artist {i % 1000}") for i in range(n)]
+
+    def run():
+        for title, artist in titles:
+            playlist.add_song(title, artist)
+    return run, n
+
+def _remove_song(playlist_class, n):
+    # Removes the most recently added songs (the worst case for a front-to-back scan),
+    # then adds them back at the end so the shared playlist keeps its size and order
+    playlist = shared_playlist(n, playlist_class)
+    ops = min(n, PER_SIZE_OPS)
+    songs = [(f"Song {i}", f"Artist {i % 1000}") for i in range(n - ops, n)]
+
+    def run():
+        for title, _ in reversed(songs):
+            playlist.remove_song(title.lower()) # Lookups ignore case
+        for title, artist in songs:
+            playlist.add_song(title, artist)
+    return run, ops
+
+
+@benchmark("playlist.add_song")
+def playlist_add_song(n):
+    return _add_song(task_module(4).Playlist, n)
+
+@benchmark("playlist_list.add_song")
+def playlist_list_add_song(n):
+    return _add_song(baselines.ListPlaylist, n)
+
+
+@benchmark("playlist.add_songs")
+def playlist_add_songs(n):
+    playlist = task_module(4).Playlist("Bench Mix")
+    pairs = [(f"Song {i}", f"Artist {i % 1000}") for i in range(n)]
+
+    def run():
+        playlist.add_songs(pairs)
+    return run, n
+
+
+@benchmark("playlist.remove_song")
+def playlist_remove_song(n):
+    return _remove_song(task_module(4).Playlist, n)
+
+@benchmark("playlist_list.remove_song", max_size=100_000)
+def playlist_list_remove_song(n):
+    return _remove_song(baselines.ListPlaylist, n)
+
+
+@benchmark("playlist.remove_all")
+def playlist_remove_all(n):
+    # Every song, oldest first: exercises the tombstones and compaction
+    playlist = make_playlist(n)
+    titles = [f"Song {i}" for i in range(n)]
+
+    def run():
+        for title in titles:
+            playlist.remove_song(title)
+    return run, n
+
+
+@benchmark("playlist.find_song")
+def playlist_find_song(n):
+    playlist = shared_playlist(n)
+    ops = min(n, PER_SIZE_OPS)
+    titles = [f"SONG {i}" for i in range(n - 1, n - 1 - ops, -1)]
+
+    def run():
+        for title in titles:
+            playlist.find_song(title)
+    return run, ops
+
+
+@benchmark("playlist.song_at")
+def playlist_song_at(n):
+    playlist = shared_playlist(n)
+    positions = range(0, n, max(1, n // PER_SIZE_OPS))
+
+    def run():
+        for position in positions:
+            playlist.song_at(position)
+    return run, len(positions)
+
+
+@benchmark("playlist.page")
+def playlist_page(n):
+    # One 20-song page from the middle: should cost the same at any playlist size
+    playlist = shared_playlist(n)
+    page_index = playlist.song_count() // 40
+
+    def run():
+        for _ in range(PER_SIZE_OPS):
+            playlist.page(page_index, 20)
+    return run, PER_SIZE_OPS
+
+
+_own_playlists = {}
+
+def _rated_playlist(n):
+    # Its own playlist, not shared_playlist(n): setting ratings (and building samplers, which every
+    # later add/remove keeps up to date) would change what the other benchmarks measure
+    if ("rated", n) not in _own_playlists:
+        with print_mode("silent"):
+            playlist = make_playlist(n)
+        for i, song in enumerate(playlist.iter_songs()):
+            song.rating = i % 5 + 1
+        _own_playlists[("rated", n)] = playlist
+    return _own_playlists[("rated", n)]
+
+def _played_playlist(n):
+    # Only playlist.record_play uses it: its play counts keep growing from one sample to the next
+    if ("played", n) not in _own_playlists:
+        with print_mode("silent"):
+            _own_playlists[("played", n)] = make_playlist(n)
+    return _own_playlists[("played", n)]
+
+
+@benchmark("playlist.pick_song")
+def playlist_pick_song(n):
+    playlist = _rated_playlist(n)
+    playlist.pick_song("rating") # Builds the sampler outside the timed run
+
+    def run():
+        for _ in range(PER_SIZE_OPS):
+            playlist.pick_song("rating")
+    return run, PER_SIZE_OPS
+
+@benchmark("playlist_list.choices_draw", max_size=100_000)
+def playlist_list_choices_draw(n):
+    songs = list(_rated_playlist(n).songs) # A plain list, like the original Playlist.songs
+    rng = random.Random(1)
+
+    def run():
+        for _ in range(PER_SIZE_OPS):
+            baselines.choices_draw(songs, "rating", rng)
+    return run, PER_SIZE_OPS
+
+
+@benchmark("playlist.record_play")
+def playlist_record_play(n):
+    # Incremental weight update of a play-count-weighted sampler
+    playlist = _played_playlist(n)
+    playlist.pick_song("play_count")
+    songs = [playlist.song_at(position) for position in range(0, playlist.song_count(), max(1, n // PER_SIZE_OPS))]
+
+    def run():
+        for song in songs:
+            playlist.record_play(song)
+    return run, len(songs)
+
+
+@benchmark("playlist.shuffled")
+def playlist_shuffled(n):
+    # The first PER_SIZE_OPS songs of a no-repeat shuffle: no O(n) copy up front
+    playlist = shared_playlist(n)
+
+    def run():
+        for _ in islice(playlist.shuffled(seed=1), PER_SIZE_OPS):
+            pass
+    return run, min(PER_SIZE_OPS, playlist.song_count())
+
+
+def bytes_per_song(playlist_class, n):
+    # Traced memory of an n-song playlist built with the default print mode, divided by n
+    tracemalloc.start()
+    try:
+        with print_mode("silent"):
+            playlist = make_playlist(n, playlist_class) # Kept alive until it has been measured
+        return tracemalloc.get_traced_memory()[0] / n
+    finally:
+        tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    # python -m benchmarks.playlist [n]: memory per song, indexed columns vs the original list of objects
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    for label, playlist_class in (("Playlist", task_module(4).Playlist), ("ListPlaylist", baselines.ListPlaylist)):
+        print(f"{label:<14}{bytes_per_song(playlist_class, size):>8.0f} bytes/song at n={size:,}")
@@ -0,0 +1,127 @@
+"""
+Task 12: AccountRegistry.transfer. The timing suite measures one thread; run this module
+for the stress test across threads (one shared registry) and processes (one shard each):
+
+    python -m benchmarks.transfers
+    python -m benchmarks.transfers --accounts 1000 --transfers 400000 --threads 1,2,4,8 --processes 1,2,4
+
+Every run checks that no money was created or lost and that each account's txn ids are 1..n.
+"""
+import argparse
+import concurrent.futures
+import random
+import sys
+import threading
+import time
+
+from benchmarks import PER_SIZE_OPS, benchmark, print_mode, task_module
+
+INITIAL_CENTS = 100_000
+
+
+def make_registry(accounts):
+    module = task_module(12)
+    with print_mode("silent"):
+        registry = module.AccountRegistry()
+        for i in range(accounts):
+            registry.open_account(f"Account {i}", INITIAL_CENTS / 100)
+    return registry
+
+
+def _transfer_loop(registry, accounts, transfers, seed):
+    rng = random.Random(seed)
+    transfer = registry.transfer
+    for _ in range(transfers):
+        src, dst = rng.sample(accounts, 2)
+        transfer(src, dst, rng.randint(1, 500) / 100)
+
+
+def check(registry):
+    accounts = registry.accounts()
+    if round(registry.total_balance() * 100) != INITIAL_CENTS * len(accounts):
+        raise AssertionError("Transfers created or lost money.")
+    for account in accounts:
+        txn_ids = account._BankAccount__transaction_log.txn_ids
+        if list(txn_ids) != list(range(1, len(txn_ids) + 1)):
+            raise AssertionError(f"Account {account.account_number} has duplicate or out-of-order txn ids.")
+
+
+def run_threads(threads, accounts, transfers):
+    registry = make_registry(accounts)
+    members = registry.accounts()
+    workers = [threading.Thread(target=_transfer_loop, args=(registry, members, transfers // threads, seed))
+               for seed in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    check(registry)
+    return transfers // threads * threads / elapsed
+
+
+def _run_shard(accounts, transfers, seed):
+    # One process owns one shard of the accounts: no locks are shared between processes
+    registry = make_registry(accounts)
+    start = time.perf_counter()
+    _transfer_loop(registry, registry.accounts(), transfers, seed)
+    elapsed = time.perf_counter() - start
+    check(registry)
+    return transfers, elapsed
+
+
+def _warm_worker(_):
+    task_module(12)
+
+def run_processes(processes, accounts, transfers):
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as pool:
+        list(pool.map(_warm_worker, range(processes))) # Start the workers and load the tasks before timing
+        start = time.perf_counter()
+        shards = list(pool.map(_run_shard, [max(2, accounts // processes)] * processes,
+                               [transfers // processes] * processes, range(processes)))
+        elapsed = time.perf_counter() - start
+    return sum(done for done, _ in shards) / elapsed
+
+
+_shared_registries = {}
+
+@benchmark("registry.transfer")
+def registry_transfer(n):
+    # n accounts; the cost of one uncontended transfer should not depend on n
+    if n not in _shared_registries: # Transfers keep the total constant, so one registry serves every sample
+        _shared_registries[n] = make_registry(max(n, 2))
+    registry = _shared_registries[n]
+    members = registry.accounts()
+
+    def run():
+        _transfer_loop(registry, members, PER_SIZE_OPS, 0)
+    return run, PER_SIZE_OPS
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.transfers", description="Stress-test concurrent transfers.")
+    parser.add_argument("--accounts", type=int, default=1000, help="Accounts in the registry (split across processes)")
+    parser.add_argument("--transfers", type=int, default=200_000, help="Transfers per run, split across workers")
+    parser.add_argument("--threads", default="1,2,4,8", help="Comma-separated thread counts")
+    parser.add_argument("--processes", default="1,2,4", help="Comma-separated process counts (0 to skip)")
+    args = parser.parse_args(argv)
+
+    # transfer() prints nothing; only building the registries is silenced
+    print(f"{'workers':<16}{'transfers/s':>14}{'vs 1':>8}")
+    base = None
+    for threads in map(int, args.threads.split(",")):
+        rate = run_threads(threads, args.accounts, args.transfers)
+        base = base or rate
+        print(f"{f'{threads} thread(s)':<16}{rate:>14,.0f}{rate / base:>7.2f}x", flush=True)
+    base = None
+    for processes in map(int, args.processes.split(",")):
+        if processes:
+            rate = run_processes(processes, args.accounts, args.transfers)
+            base = base or rate
+            print(f"{f'{processes} process(es)':<16}{rate:>14,.0f}{rate / base:>7.2f}x", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+"""
+Task 18: WordCollection. The wordcollection_list.* cases time the original sorted-list WordCollection.
+"""
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks import PER_SIZE_OPS, baselines, benchmark, print_mode, task_module
+
+
+def make_words(n, prefix="w"):
+    return [f"{prefix}{i:07d}" for i in range(n)]
+
+
+def make_collection(n, collection_class=None):
+    return (collection_class or task_module(18).WordCollection)(",".join(make_words(n)))
+
+
+def _add_word(collection_class, n):
+    collection = make_collection(n, collection_class)
+    ops = min(n, PER_SIZE_OPS)
+    new_words = make_words(ops, prefix="new")
+
+    def run():
+        for word in new_words:
+            collection.add_word(word)
+    return run, ops
+
+def _contains(collection_class, n):
+    collection = make_collection(n, collection_class)
+    words = [f"w{(i * 7919) % (2 * n):07d}" for i in range(min(n, PER_SIZE_OPS))] # Half of them missing
+
+    def run():
+        for word in words:
+            word in collection
+    return run, len(words)
+
+
+@benchmark("wordcollection.add_word")
+def wordcollection_add_word(n):
+    return _add_word(task_module(18).WordCollection, n)
+
+@benchmark("wordcollection_list.add_word", max_size=100_000)
+def wordcollection_list_add_word(n):
+    return _add_word(baselines.ListWordCollection, n)
+
+
+@benchmark("wordcollection.add_words")
+def wordcollection_add_words(n):
+    # Merging n new words (interleaved with the existing ones) into an n-word collection
+    collection = make_collection(n)
+    new_words = [f"w{i:07d}x" for i in range(n)]
+
+    def run():
+        collection.add_words(new_words)
+    return run, n
+
+
+@benchmark("wordcollection.__contains__")
+def wordcollection_contains(n):
+    return _contains(task_module(18).WordCollection, n)
+
+@benchmark("wordcollection_list.__contains__", max_size=100_000)
+def wordcollection_list_contains(n):
+    # No __contains__: `in` falls back to calling __getitem__ 0, 1, 2, ...
+    return _contains(baselines.ListWordCollection, n)
+
+
+@benchmark("wordcollection.__getitem__")
+def wordcollection_getitem(n):
+    collection = make_collection(n)
+    indexes = [(i * 7919) % n for i in range(n)] # Spread over the collection
+
+    def run():
+        for i in indexes:
+            collection[i]
+    return run, n
+
+
+def _slice(collection_class, n):
+    # The middle half of the collection
+    collection = make_collection(n, collection_class)
+
+    def run():
+        for _ in range(PER_SIZE_OPS):
+            collection[n // 4:3 * n // 4]
+    return run, PER_SIZE_OPS
+
+
+@benchmark("wordcollection.__getitem__slice")
+def wordcollection_getitem_slice(n):
+    return _slice(task_module(18).WordCollection, n)
+
+@benchmark("wordcollection_list.__getitem__slice")
+def wordcollection_list_getitem_slice(n):
+    return _slice(baselines.ListWordCollection, n)
+
+
+@benchmark("wordcollection.slice_iter")
+def wordcollection_slice_iter(n):
+    # Reading every word of a half-collection view
+    view = make_collection(n)[n // 4:3 * n // 4]
+
+    def run():
+        for _ in view:
+            pass
+    return run, len(view)
+
+
+@benchmark("wordcollection.from_stream")
+def wordcollection_from_stream(n):
+    # n words in 1000-word lines with ~50% repeats, cleaned and merged in this process (workers=1)
+    words = make_words(n // 2 + 1) * 2
+    lines = [" ".join(words[i:i + 1000]).upper() for i in range(0, n, 1000)]
+    WordCollection = task_module(18).WordCollection
+
+    def run():
+        WordCollection.from_stream(lines, workers=1, chunk_size=1 << 16)
+    return run, n
+
+
+
+def _prefix_of_ten(n):
+    # A prefix shared by ten words in the middle of make_words(n)
+    return f"w{n // 2:07d}"[:-1]
+
+
+@benchmark("wordcollection.with_prefix")
+def wordcollection_with_prefix(n):
+    collection = make_collection(n)
+    prefix = _prefix_of_ten(n)
+
+    def run():
+        for _ in range(PER_SIZE_OPS):
+            list(collection.with_prefix(prefix))
+    return run, PER_SIZE_OPS
+
+@benchmark("wordcollection_list.with_prefix", max_size=100_000)
+def wordcollection_list_with_prefix(n):
+    words = make_collection(n, baselines.ListWordCollection)._words
+    prefix = _prefix_of_ten(n)
+
+    def run():
+        for _ in range(PER_SIZE_OPS):
+            baselines.scan_prefix(words, prefix)
+    return run, PER_SIZE_OPS
+
+
+@benchmark("wordcollection.count_between")
+def wordcollection_count_between(n):
+    collection = make_collection(n)
+
+    def run():
+        for i in range(PER_SIZE_OPS):
+            collection.count_between(f"w{i:07d}", f"w{n - i:07d}")
+    return run, PER_SIZE_OPS
+
+@benchmark("wordcollection_list.count_between", max_size=100_000)
+def wordcollection_list_count_between(n):
+    words = make_collection(n, baselines.ListWordCollection)._words
+
+    def run():
+        for i in range(PER_SIZE_OPS):
+            baselines.scan_count_between(words, f"w{i:07d}", f"w{n - i:07d}")
+    return run, PER_SIZE_OPS
+
+
+@benchmark("wordcollection.nearest")
+def wordcollection_nearest(n):
+    collection = make_collection(n)
+    words = [f"w{(i * 7919) % n:07d}x" for i in range(PER_SIZE_OPS)]
+
+    def run():
+        for word in words:
+            list(collection.nearest(word, 10))
+    return run, PER_SIZE_OPS
+
+
+_tables = {}
+
+def saved_table(n):
+    # One saved n-word collection per size, in a temporary directory removed at exit
+    if n not in _tables:
+        table_dir = tempfile.mkdtemp(prefix="oop-lab-sst-")
+        atexit.register(shutil.rmtree, table_dir, True)
+        _tables[n] = os.path.join(table_dir, f"words-{n}.sst")
+        with print_mode("silent"):
+            make_collection(n).save(_tables[n])
+    return _tables[n]
+
+
+@benchmark("mappedwordcollection.open")
+def mappedwordcollection_open(n):
+    # Header + mmap only: should not grow with n
+    path = saved_table(n)
+    MappedWordCollection = task_module(18).MappedWordCollection
+
+    def run():
+        for _ in range(PER_SIZE_OPS):
+            MappedWordCollection(path).close()
+    return run, PER_SIZE_OPS
+
+
+@benchmark("mappedwordcollection.__getitem__")
+def mappedwordcollection_getitem(n):
+    table = task_module(18).MappedWordCollection(saved_table(n))
+    indexes = [(i * 7919) % n for i in range(min(n, 10_000))]
+
+    def run():
+        for i in indexes:
+            table[i]
+    return run, len(indexes)
+
+
+@benchmark("mappedwordcollection.__contains__")
+def mappedwordcollection_contains(n):
+    table = task_module(18).MappedWordCollection(saved_table(n))
+    words = [f"w{(i * 7919) % (2 * n):07d}" for i in range(min(n, PER_SIZE_OPS))] # Half of them missing
+
+    def run():
+        for word in words:
+            word in table
+    return run, len(words)
+
+
+@benchmark("mappedwordcollection.with_prefix")
+def mappedwordcollection_with_prefix(n):
+    table = task_module(18).MappedWordCollection(saved_table(n))
+    prefix = _prefix_of_ten(n)
+
+    def run():
+        for _ in range(PER_SIZE_OPS):
+            list(table.with_prefix(prefix))
+    return run, PER_SIZE_OPS
+
+
+if __name__ == "__main__":
+    # python -m benchmarks.words [n]: time to slice half of an n-word collection, view vs list copy
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    words = make_words(size)
+    with print_mode("silent"):
+        collection = task_module(18).WordCollection()
+        collection.add_words(words)
+        start = time.perf_counter()
+        view = collection[size // 4:3 * size // 4] # Also builds the block offsets, once per change
+        first_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        view = collection[size // 4:3 * size // 4]
+        view_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    words[size // 4:3 * size // 4]
+    copy_seconds = time.perf_counter() - start
+    print(f"WordSlice view{view_seconds * 1e6:>12,.1f} us for {len(view):,} of {size:,} words ({first_seconds * 1e6:,.1f} us the first time)")
+    print(f"list copy     {copy_seconds * 1e6:>12,.1f} us")
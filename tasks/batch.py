@@ -0,0 +1,91 @@
+"""
+Headless batch runner: runs every task's run_task with its get_input_params() defaults
+in a process pool and writes one JSON line per task.
+
+    python -m tasks.batch                      # all tasks, results to stdout
+    python -m tasks.batch -o results.jsonl -j 4 --timeout 60
+    python -m tasks.batch --tasks 4,12,18      # only these task numbers
+
+Exit status is 1 if any task failed, so it can gate a deployment smoke test.
+"""
+import argparse
+import concurrent.futures
+import json
+import os
+import sys
+import time
+import traceback
+
+from tasks.executor import TaskExecutor
+from tasks.registry import TaskRegistry, get_task_number
+
+
+def run_batch(task_dir, workers=None, timeout=60, task_numbers=None):
+    """
+    Runs the selected tasks (all by default) and returns one record per task, in task order.
+    """
+    tasks, messages, _ = TaskRegistry(task_dir, lazy=True).load() # Same discovery rules as the app
+    records = [{"task": None, "file": None, "ok": False, "error": text, "traceback": details}
+               for level, text, details in messages if level == "error"]
+
+    selected = [(name, task_data) for name, task_data in tasks.items()
+                if task_numbers is None or get_task_number(task_data["file_name"]) in task_numbers]
+    workers = workers or os.cpu_count() or 1
+    # One task per fresh worker process that imports only that task's module,
+    # so peak RSS and CPU time belong to that task alone
+    executor = TaskExecutor(task_dir, max_workers=workers, max_tasks_per_child=1, preload=False)
+
+    def run_one(task_name, task_data):
+        try:
+            return _record(task_name, task_data)
+        except Exception as e: # Never let one task's failure abort the map and lose the other records
+            return {"task": task_name, "file": task_data["file_name"], "ok": False,
+                    "error": f"{type(e).__name__} - {e}", "traceback": traceback.format_exc()}
+
+    def _record(task_name, task_data):
+        result = executor.run(task_data["file_name"], None, timeout=timeout)
+        record = {"task": task_name, "file": task_data["file_name"], "ok": result["error"] is None}
+        record.update(result)
+        record["stdout"] = record.pop("output")
+        record["wall_ms"] = record.pop("elapsed_ms")
+        return record
+
+    try:
+        # Threads only wait on the workers; at most `workers` calls are in flight so none queue past their timeout
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as waiters:
+            records.extend(waiters.map(lambda item: run_one(*item), selected))
+    finally:
+        executor.shutdown()
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run every OOP lab task headlessly with its default inputs.")
+    parser.add_argument("--task-dir", default="tasks", help="Directory containing task_XX_*.py files (default: tasks)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=60, help="Wall-clock seconds allowed per task (default: 60)")
+    parser.add_argument("--tasks", default=None, help="Comma-separated task numbers to run (default: all)")
+    parser.add_argument("-o", "--output", default="-", help="JSON lines output file, '-' for stdout (default)")
+    args = parser.parse_args(argv)
+
+    task_numbers = {int(n) for n in args.tasks.split(",")} if args.tasks else None
+    start = time.perf_counter()
+    records = run_batch(args.task_dir, workers=args.workers, timeout=args.timeout, task_numbers=task_numbers)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        for record in records:
+            out.write(json.dumps(record, default=repr) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    failed = [record for record in records if not record["ok"]]
+    print(f"{len(records) - len(failed)}/{len(records)} tasks passed in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    for record in failed:
+        print(f"  FAILED {record['task'] or '(load error)'}: {record['error']}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,384 @@
+import atexit
+import concurrent.futures
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures.process import BrokenProcessPool
+
+from tasks.profiling import profiled
+from tasks.registry import TaskRegistry
+from tasks.utils import BoundedOutput, QueueWriter, build_task_args, default_inputs, redirect_output
+
+try:
+    import resource # Unix only; peak RSS is reported as None elsewhere
+except ImportError:
+    resource = None
+
+DEFAULT_TIMEOUT_SECONDS = 30
+STREAM_POLL_SECONDS = 0.1 # How often a streaming reader re-checks the deadline while the task is silent
+
+
+class TaskRunError(Exception):
+    """
+    Raised by TaskExecutor.stream() when the task failed, timed out or its worker died.
+    The full result dict (error, traceback, elapsed_ms, timed_out, ...) is in `.result`.
+    """
+
+    def __init__(self, result):
+        super().__init__(result["error"])
+        self.result = result
+
+# --- Worker side (runs inside the pool processes) ---
+_worker_registry = None
+
+def _warm_worker(task_dir, preload=True):
+    # preload: import every task module up front; otherwise only the module a call needs, when it needs it
+    global _worker_registry
+    _worker_registry = TaskRegistry(task_dir, lazy=not preload)
+    _worker_registry.load()
+
+def _worker_main(task_dir, conn, preload=True):
+    # A pool process: warms up, then runs one (fn, args) call at a time from conn until it gets None
+    _warm_worker(task_dir, preload)
+    while True:
+        try:
+            call = conn.recv()
+        except EOFError:
+            return # The executor went away
+        if call is None:
+            return
+        fn, args = call
+        conn.send(fn(*args))
+
+def _find_worker_task(file_name):
+    tasks, messages, _ = _worker_registry.load() # Cheap stat() check, picks up edited task files
+    for task_data in tasks.values():
+        if task_data["file_name"] == file_name:
+            if _worker_registry.lazy:
+                import_messages = _worker_registry.import_task(task_data)
+                if task_data["module"] is None:
+                    raise ImportError("; ".join(text for _, text, _ in import_messages) or f"Could not import '{file_name}'.")
+            return task_data
+    details = "; ".join(text for _, text, _ in messages)
+    raise LookupError(f"Task file '{file_name}' is not available in the worker. {details}".strip())
+
+def _resolve_params(task_data, task_params):
+    # None means "what the form starts with": get_input_params() defaults over run_task's own defaults
+    if task_params is not None:
+        return task_params
+    input_params = task_data["input_params"]
+    if input_params is None and task_data["get_input_params_function"]:
+        input_params = task_data["get_input_params_function"]()
+    return build_task_args(task_data["run_function"], default_inputs(input_params))
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak # macOS reports bytes, Linux KiB
+
+def _new_result():
+    return {"output": "", "error": None, "traceback": None, "params": None, "elapsed_ms": 0.0, "cpu_ms": 0.0,
+            "peak_rss_kb": None, "timed_out": False, "worker_pid": os.getpid(), "profile": None}
+
+def _finish_result(result, start, cpu_start):
+    result["elapsed_ms"] = (time.perf_counter() - start) * 1000
+    result["cpu_ms"] = (time.process_time() - cpu_start) * 1000
+    result["peak_rss_kb"] = _peak_rss_kb() # Per process: only per task when max_tasks_per_child=1
+    return result
+
+def _run_in_worker(file_name, task_params, profile_top_n=None):
+    start, cpu_start = time.perf_counter(), time.process_time()
+    result = _new_result()
+    output = None
+    try:
+        task_data = _find_worker_task(file_name)
+        result["params"] = task_params = _resolve_params(task_data, task_params)
+        output = BoundedOutput.from_limits(task_data["output_limits"]) # Outside the call: kept if the task raises
+        with redirect_output(output):
+            if profile_top_n:
+                with profiled(profile_top_n) as result["profile"]: # Filled in even if the task raises
+                    task_data["run_function"](**task_params)
+            else:
+                task_data["run_function"](**task_params)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__} - {e}"
+        result["traceback"] = traceback.format_exc()
+    if output is not None:
+        result["output"] = output.getvalue()
+    return _finish_result(result, start, cpu_start)
+
+def _stream_in_worker(file_name, task_params, chunk_queue):
+    # Same as _run_in_worker, but output goes to chunk_queue as it is printed (followed by a None sentinel)
+    start, cpu_start = time.perf_counter(), time.process_time()
+    result = _new_result()
+    writer = QueueWriter(chunk_queue)
+    try:
+        task_data = _find_worker_task(file_name)
+        result["params"] = task_params = _resolve_params(task_data, task_params)
+        with redirect_output(writer):
+            task_data["run_function"](**task_params)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__} - {e}"
+        result["traceback"] = traceback.format_exc()
+    finally:
+        writer.close()
+        chunk_queue.put(None)
+    return _finish_result(result, start, cpu_start)
+
+
+# --- Parent side ---
+class _Worker:
+    """
+    One pool process and the pipe it takes calls from; it runs a single call at a time.
+    """
+
+    def __init__(self, mp_context, task_dir, preload=True):
+        self.conn, child_conn = mp_context.Pipe()
+        self.process = mp_context.Process(target=_worker_main, args=(task_dir, child_conn, preload), name="TaskWorker")
+        self.process.start()
+        child_conn.close()
+        self.calls = 0
+
+    def submit(self, fn, *args):
+        self.conn.send((fn, args)) # BrokenPipeError if the process died while idle
+        self.calls += 1
+
+    def done(self):
+        return self.conn.poll() # Also true once the process is gone
+
+    def result(self, timeout):
+        if not self.conn.poll(timeout):
+            raise concurrent.futures.TimeoutError()
+        try:
+            return self.conn.recv()
+        except EOFError:
+            self.process.join(1)
+            raise BrokenProcessPool(f"The worker process (pid {self.process.pid}) exited with code "
+                                    f"{self.process.exitcode} while running the task.") from None
+
+    def stop(self, kill=False):
+        if kill:
+            self.process.terminate()
+            self.process.join(1)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join(1)
+        else:
+            try:
+                self.conn.send(None) # Exits after its current call; reaped by multiprocessing later
+            except OSError:
+                pass
+        self.conn.close()
+
+
+class _WorkerPool:
+    """
+    Warm worker processes lent out one call at a time, so a timed-out call is stopped by killing
+    its own worker only; every other call keeps running. Each worker handed back is replaced by a
+    fresh, already warming one if it was killed or reached max_tasks_per_child.
+    """
+
+    def __init__(self, mp_context, task_dir, size, max_tasks_per_child=None, preload=True):
+        self._mp_context = mp_context
+        self._task_dir = task_dir
+        self._preload = preload
+        self._max_tasks_per_child = max_tasks_per_child
+        self._lock = threading.Lock()
+        self._free = threading.Semaphore(size) # At most `size` calls in flight
+        self._idle = [self._new_worker() for _ in range(size)] # Start (and warm) every worker now, not on first use
+        self._busy = set()
+        self._closed = False
+
+    def _new_worker(self):
+        return _Worker(self._mp_context, self._task_dir, self._preload)
+
+    def acquire(self, timeout):
+        # Returns an idle worker, or None if none became free within `timeout` seconds
+        if not self._free.acquire(timeout=timeout):
+            return None
+        with self._lock:
+            if self._closed:
+                self._free.release()
+                raise RuntimeError("cannot schedule new calls after shutdown")
+            worker = self._idle.pop() if self._idle else self._new_worker()
+            self._busy.add(worker)
+        return worker
+
+    def release(self, worker, reusable=True):
+        # reusable=False kills the worker: it timed out, died, or its caller stopped waiting
+        limit = self._max_tasks_per_child
+        with self._lock:
+            self._busy.discard(worker)
+            keep = reusable and not self._closed and (limit is None or worker.calls < limit)
+            if keep:
+                self._idle.append(worker)
+            elif not self._closed:
+                self._idle.append(self._new_worker())
+        if not keep:
+            worker.stop(kill=not reusable)
+        self._free.release()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            busy = list(self._busy)
+        for worker in idle:
+            worker.stop()
+        for worker in busy: # Their callers get a BrokenProcessPool result
+            worker.process.terminate()
+
+
+class TaskExecutor:
+    """
+    Runs run_task(**params) calls in a pool of pre-warmed worker processes with a wall-clock timeout per call.
+    A call that times out is stopped by killing its own worker; the other calls are not affected.
+    Results are plain dicts: output, error, traceback, params, elapsed_ms, cpu_ms, peak_rss_kb,
+    timed_out, worker_pid and profile (see tasks.profiling.profiled, only for profiled runs).
+    preload=False makes each worker import only the task modules it runs (slower first call, but a
+    worker's peak RSS then reflects its own tasks).
+    """
+
+    def __init__(self, task_dir, max_workers=None, max_tasks_per_child=None, preload=True):
+        self.task_dir = os.path.abspath(task_dir)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_tasks_per_child = max_tasks_per_child
+        self.preload = preload
+        # 'spawn' so workers never inherit the server's threads/locks mid-flight
+        self._mp_context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._pool = None
+        self._manager = None # Owns the queues that carry streamed output back from the workers
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = _WorkerPool(self._mp_context, self.task_dir, self.max_workers,
+                                         self.max_tasks_per_child, self.preload)
+            return self._pool
+
+    def _get_manager(self):
+        with self._lock:
+            if self._manager is None:
+                self._manager = self._mp_context.Manager()
+            return self._manager
+
+    def _submit(self, deadline, fn, *args):
+        # Hands the call to an idle worker. One that died while idle is replaced and the call sent
+        # once more. Returns (pool, worker); raises TimeoutError if no worker became free in time.
+        pool = self._get_pool()
+        for attempt in range(2):
+            worker = pool.acquire(max(0.0, deadline - time.perf_counter()))
+            if worker is None:
+                raise concurrent.futures.TimeoutError()
+            try:
+                worker.submit(fn, *args)
+                return pool, worker
+            except OSError:
+                pool.release(worker, reusable=False)
+                if attempt:
+                    raise
+
+    def run(self, file_name, task_params, timeout=DEFAULT_TIMEOUT_SECONDS, profile_top_n=None):
+        """
+        Runs the task defined in task_dir/file_name and waits at most `timeout` seconds.
+        task_params=None runs it with its get_input_params() defaults.
+        profile_top_n=N profiles the call (cProfile + tracemalloc) and keeps the top N entries.
+        Never raises for task failures; they are reported in the result dict.
+        """
+        start = time.perf_counter()
+        try:
+            pool, worker = self._submit(start + timeout, _run_in_worker, file_name, task_params, profile_top_n)
+        except concurrent.futures.TimeoutError:
+            return _failed_result(f"TimeoutError - No worker became free within {timeout} seconds.", start, timed_out=True)
+        except (OSError, RuntimeError) as e:
+            return _failed_result(f"{type(e).__name__} - {e}", start, details=traceback.format_exc())
+
+        reusable = False
+        try:
+            result = worker.result(max(0.0, start + timeout - time.perf_counter()))
+            reusable = True
+            return result
+        except concurrent.futures.TimeoutError:
+            return _failed_result(f"TimeoutError - Task did not finish within {timeout} seconds and was stopped.", start, timed_out=True)
+        except (BrokenProcessPool, OSError) as e:
+            return _failed_result(f"{type(e).__name__} - {e}", start, details=traceback.format_exc())
+        finally:
+            pool.release(worker, reusable)
+
+    def stream(self, file_name, task_params, timeout=DEFAULT_TIMEOUT_SECONDS):
+        """
+        Like run(), but a generator that yields output chunks while the task is still printing.
+        Raises TaskRunError after the last chunk if the task failed or timed out.
+        Closing the generator early stops the task.
+        """
+        start = time.perf_counter()
+        deadline = start + timeout
+        chunk_queue = self._get_manager().Queue()
+        try:
+            pool, worker = self._submit(deadline, _stream_in_worker, file_name, task_params, chunk_queue)
+        except concurrent.futures.TimeoutError:
+            raise TaskRunError(_failed_result(f"TimeoutError - No worker became free within {timeout} seconds.", start, timed_out=True)) from None
+        except (OSError, RuntimeError) as e:
+            raise TaskRunError(_failed_result(f"{type(e).__name__} - {e}", start, details=traceback.format_exc())) from None
+
+        reusable = False
+        try:
+            while True:
+                if time.perf_counter() > deadline: # Checked on every chunk, so a task printing in a loop still times out
+                    raise concurrent.futures.TimeoutError()
+                try:
+                    chunk = chunk_queue.get(timeout=STREAM_POLL_SECONDS)
+                except queue.Empty:
+                    if worker.done():
+                        break # Worker died before sending the sentinel; worker.result() below tells us why
+                    continue
+                if chunk is None:
+                    break
+                yield chunk
+            result = worker.result(max(0.0, deadline - time.perf_counter()))
+            reusable = True
+        except concurrent.futures.TimeoutError:
+            result = _failed_result(f"TimeoutError - Task did not finish within {timeout} seconds and was stopped.", start, timed_out=True)
+        except (BrokenProcessPool, OSError) as e:
+            result = _failed_result(f"{type(e).__name__} - {e}", start, details=traceback.format_exc())
+        finally:
+            pool.release(worker, reusable)
+        if result["error"]:
+            raise TaskRunError(result)
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+            manager, self._manager = self._manager, None
+        if pool is not None:
+            pool.close()
+        if manager is not None:
+            manager.shutdown()
+
+
+def _failed_result(error, start, details=None, timed_out=False):
+    result = _new_result()
+    result.update(error=error, traceback=details, timed_out=timed_out, worker_pid=None,
+                  elapsed_ms=(time.perf_counter() - start) * 1000)
+    return result
+
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+def get_executor(task_dir, max_workers=None):
+    """
+    Returns the shared TaskExecutor for task_dir (one pool per process, survives Streamlit reruns).
+    """
+    key = os.path.abspath(task_dir)
+    with _executors_lock:
+        if key not in _executors:
+            _executors[key] = TaskExecutor(task_dir, max_workers=max_workers)
+            atexit.register(_executors[key].shutdown)
+        return _executors[key]
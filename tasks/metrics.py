@@ -0,0 +1,179 @@
+import http.server
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+COUNTER_HELP = {
+    "runs": "Task runs started from the app.",
+    "errors": "Task runs that ended with an error or timeout.",
+    "cache_hits": "Task runs served from the result cache.",
+    "output_bytes": "UTF-8 bytes of console output produced by task runs.",
+}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _labels(**labels):
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class LabMetrics:
+    """
+    In-process latency histograms and counters for the app's phases
+    (load, form, execute, render), labelled per task, with optional per-task latency SLOs.
+    Rendered in the Prometheus text exposition format; no external service needed.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._histograms = {} # (phase, task) -> {"counts": [...], "sum": float, "count": int}
+        self._counters = {} # (name, task) -> number
+        self._slos = {} # (phase, task) -> seconds
+        self._slo_violations = {} # (phase, task) -> count
+        self._server = None
+
+    def set_slo(self, task, seconds, phase="execute"):
+        with self._lock:
+            if seconds is None:
+                self._slos.pop((phase, task), None)
+            else:
+                self._slos[(phase, task)] = float(seconds)
+
+    def set_task_slos(self, task, latency_slo):
+        """
+        Applies a task's LATENCY_SLO_SECONDS: a number is the "execute" SLO, a dict maps phase -> seconds.
+        """
+        if latency_slo is None:
+            return
+        if not isinstance(latency_slo, dict):
+            latency_slo = {"execute": latency_slo}
+        for phase, seconds in latency_slo.items():
+            self.set_slo(task, seconds, phase=phase)
+
+    def observe(self, phase, task, seconds):
+        """
+        Records one timing. Returns True if it exceeded the task's SLO for this phase.
+        """
+        with self._lock:
+            histogram = self._histograms.get((phase, task))
+            if histogram is None:
+                histogram = self._histograms[(phase, task)] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, upper_bound in enumerate(self.buckets):
+                if seconds <= upper_bound:
+                    histogram["counts"][i] += 1
+                    break
+            histogram["sum"] += seconds
+            histogram["count"] += 1
+            slo = self._slos.get((phase, task))
+            if slo is not None and seconds > slo:
+                self._slo_violations[(phase, task)] = self._slo_violations.get((phase, task), 0) + 1
+                return True
+            return False
+
+    @contextmanager
+    def time_phase(self, phase, task=""):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, task, time.perf_counter() - start)
+
+    def inc(self, name, task="", amount=1):
+        with self._lock:
+            self._counters[(name, task)] = self._counters.get((name, task), 0) + amount
+
+    def render_prometheus(self):
+        with self._lock:
+            lines = [
+                "# HELP oop_lab_phase_duration_seconds Time spent in each app phase, per task.",
+                "# TYPE oop_lab_phase_duration_seconds histogram",
+            ]
+            for (phase, task), histogram in sorted(self._histograms.items()):
+                cumulative = 0
+                for upper_bound, count in zip(self.buckets, histogram["counts"]):
+                    cumulative += count
+                    lines.append(f"oop_lab_phase_duration_seconds_bucket{_labels(phase=phase, task=task, le=upper_bound)} {cumulative}")
+                lines.append(f"oop_lab_phase_duration_seconds_bucket{_labels(phase=phase, task=task, le='+Inf')} {histogram['count']}")
+                lines.append(f"oop_lab_phase_duration_seconds_sum{_labels(phase=phase, task=task)} {histogram['sum']}")
+                lines.append(f"oop_lab_phase_duration_seconds_count{_labels(phase=phase, task=task)} {histogram['count']}")
+
+            for name, help_text in COUNTER_HELP.items():
+                values = sorted((task, value) for (counter, task), value in self._counters.items() if counter == name)
+                lines.append(f"# HELP oop_lab_{name}_total {help_text}")
+                lines.append(f"# TYPE oop_lab_{name}_total counter")
+                lines.extend(f"oop_lab_{name}_total{_labels(task=task)} {value}" for task, value in values)
+
+            lines.append("# HELP oop_lab_latency_slo_seconds Configured latency SLO per task and phase.")
+            lines.append("# TYPE oop_lab_latency_slo_seconds gauge")
+            for (phase, task), seconds in sorted(self._slos.items()):
+                lines.append(f"oop_lab_latency_slo_seconds{_labels(phase=phase, task=task)} {seconds}")
+            lines.append("# HELP oop_lab_slo_violations_total Phase timings that exceeded the task's latency SLO.")
+            lines.append("# TYPE oop_lab_slo_violations_total counter")
+            for (phase, task), count in sorted(self._slo_violations.items()):
+                lines.append(f"oop_lab_slo_violations_total{_labels(phase=phase, task=task)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """
+        Writes the metrics to `path` atomically (e.g. for node_exporter's textfile collector).
+        """
+        # A unique temp file per call: Streamlit sessions are threads of one process and may write at once
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=os.path.basename(path) + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render_prometheus())
+            os.chmod(temp_path, 0o644) # mkstemp creates it owner-only; the collector usually runs as another user
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def start_http_server(self, port, host="127.0.0.1"):
+        """
+        Serves the metrics on http://host:port/metrics from a daemon thread. Idempotent.
+        """
+        with self._lock:
+            if self._server is not None:
+                return self._server
+            metrics = self
+
+            class MetricsHandler(http.server.BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                        self.send_error(404)
+                        return
+                    body = metrics.render_prometheus().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass # Keep scrapes out of the app's console
+
+            self._server = http.server.ThreadingHTTPServer((host, port), MetricsHandler)
+            threading.Thread(target=self._server.serve_forever, daemon=True).start()
+            return self._server
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+def get_metrics():
+    """
+    Returns the process-wide LabMetrics shared by all sessions.
+    """
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = LabMetrics()
+        return _metrics
@@ -0,0 +1,52 @@
+import cProfile
+import io
+import marshal
+import pstats
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+DEFAULT_TOP_N = 20
+
+# tracemalloc is process-wide: two profiled runs in one process would see each other's allocations
+_profile_lock = threading.Lock()
+
+
+@contextmanager
+def profiled(top_n=DEFAULT_TOP_N):
+    """
+    Profiles the code inside the block with cProfile (calling thread) and tracemalloc.
+    Yields a dict that is filled in when the block exits, even if it raised:
+      top_functions   -- pstats text of the top_n functions by cumulative time
+      pstats          -- the raw profile, in the format of Profile.dump_stats() (load with pstats.Stats)
+      peak_bytes      -- peak traced memory during the block
+      top_allocations -- [{"location", "size_bytes", "count"}] still allocated at the end, largest first
+    """
+    report = {}
+    with _profile_lock:
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield report
+        finally:
+            profiler.disable()
+            report["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ))
+            if not was_tracing:
+                tracemalloc.stop()
+            report["top_allocations"] = [
+                {"location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", "size_bytes": stat.size, "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:top_n]
+            ]
+            profiler.create_stats()
+            report["pstats"] = marshal.dumps(profiler.stats)
+            stats_text = io.StringIO()
+            pstats.Stats(profiler, stream=stats_text).strip_dirs().sort_stats("cumulative").print_stats(top_n)
+            report["top_functions"] = stats_text.getvalue()
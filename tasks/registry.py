@@ -0,0 +1,294 @@
+import ast
+import hashlib
+import importlib.util
+import inspect
+import os
+import sys
+import threading
+import time
+import traceback
+
+
+def get_task_number(filename):
+    try:
+        # Extracts number after "task_" and before the next "_" or ".py"
+        num_str = filename.split('_')[1]
+        return int(num_str)
+    except (IndexError, ValueError):
+        return float('inf') # Put files with unparsable numbers at the end
+
+
+def list_task_files(task_dir):
+    """
+    Returns the 'task_XX_*.py' file names in task_dir, sorted by task number.
+    """
+    task_files_raw = [f for f in os.listdir(task_dir) if f.startswith("task_") and f.endswith(".py")]
+    return sorted(task_files_raw, key=get_task_number)
+
+
+def make_task_title(docstring, task_number, task_number_str, module_name):
+    first_line_doc = docstring.split('\n', 1)[0] # Get only the first line
+    task_title = first_line_doc
+    # Clean up common prefixes if they exist
+    task_title = task_title.replace(f"Task {task_number}: ", "").replace(f"Task {task_number_str}: ", "").strip()
+    if "Concept:" in task_title: # Further cleanup
+        task_title = task_title.split("Concept:")[0].strip()
+    if not task_title : # Fallback if parsing fails
+        task_title = module_name.replace("_", " ").title()
+    return f"Task {task_number:02d}: {task_title}"
+
+
+class TaskRegistry:
+    """
+    Process-wide cache of the task modules found in a task directory.
+    A file is only re-executed when its mtime/size changed AND its content hash differs.
+    With lazy=True, tasks are discovered from their AST only and a module is executed
+    the first time import_task() is called for it.
+    An imported task is also registered in sys.modules under its file name (unless a module from
+    another file already has that name), so its functions can be pickled, e.g. for process pools.
+    """
+
+    def __init__(self, task_dir, lazy=False):
+        self.task_dir = task_dir
+        self.lazy = lazy
+        self._entries = {} # filename -> cached build result (see _build_entry)
+        self._lock = threading.Lock() # Streamlit sessions call load() from their own threads
+        self.total_stats = {"loads": 0, "hits": 0, "rebuilds": 0, "removed": 0, "reload_ms": 0.0}
+
+    def load(self):
+        """
+        Refreshes the registry and returns (tasks, messages, stats).
+        tasks: {"Task XX: Title": task_data} in task-number order.
+        messages: [(level, text, details)] where level is "error" or "warning".
+        stats: hits / rebuilds / removed entries and reload_ms for this call.
+        """
+        with self._lock:
+            start = time.perf_counter()
+            stats = {"hits": 0, "rebuilds": 0, "removed": 0}
+            seen = set()
+
+            for filename in list_task_files(self.task_dir):
+                file_path = os.path.join(self.task_dir, filename)
+                try:
+                    file_stat = os.stat(file_path)
+                except OSError:
+                    continue # Deleted between listdir() and stat()
+                seen.add(filename)
+
+                cached = self._entries.get(filename)
+                if cached and cached["mtime_ns"] == file_stat.st_mtime_ns and cached["size"] == file_stat.st_size:
+                    stats["hits"] += 1
+                    continue
+
+                with open(file_path, "rb") as f:
+                    raw_source = f.read()
+                content_hash = hashlib.sha256(raw_source).hexdigest()
+                if cached and cached["content_hash"] == content_hash:
+                    # Touched but not edited: keep the module, remember the new stat
+                    cached["mtime_ns"] = file_stat.st_mtime_ns
+                    cached["size"] = file_stat.st_size
+                    stats["hits"] += 1
+                    continue
+
+                self._entries[filename] = self._build_entry(filename, file_path, raw_source, content_hash, file_stat)
+                stats["rebuilds"] += 1
+
+            for filename in set(self._entries) - seen:
+                del self._entries[filename]
+                stats["removed"] += 1
+
+            tasks = {}
+            messages = []
+            for filename in sorted(self._entries, key=get_task_number):
+                entry = self._entries[filename]
+                messages.extend(entry["messages"])
+                if entry["task_name"] is not None:
+                    tasks[entry["task_name"]] = entry["task_data"]
+
+            stats["reload_ms"] = (time.perf_counter() - start) * 1000
+            self.total_stats["loads"] += 1
+            for key, value in stats.items():
+                self.total_stats[key] += value
+            return tasks, messages, stats
+
+    def import_task(self, task_data):
+        """
+        Executes the module behind a lazily discovered task (no-op if already imported).
+        Fills in task_data["module"], ["run_function"] and ["get_input_params_function"];
+        returns a list of (level, text, details) messages if the import failed.
+        """
+        with self._lock:
+            if task_data["module"] is not None:
+                return []
+            file_path = os.path.join(self.task_dir, task_data["file_name"])
+            module, messages = _exec_task_module(task_data["file_name"], file_path)
+            if module is not None:
+                task_data["module"] = module
+                task_data["run_function"] = module.run_task
+                task_data["get_input_params_function"] = getattr(module, "get_input_params", None)
+            return messages
+
+    def _build_entry(self, filename, file_path, raw_source, content_hash, file_stat):
+        entry = {
+            "mtime_ns": file_stat.st_mtime_ns,
+            "size": file_stat.st_size,
+            "content_hash": content_hash,
+            "task_name": None,
+            "task_data": None,
+            "messages": [], # Cached too, so a broken file is reported on every rerun without re-executing it
+        }
+        module_name = filename[:-3] # Remove .py
+        try:
+            task_number_str = module_name.split('_')[1]
+            task_number = int(task_number_str)
+        except (IndexError, ValueError):
+            entry["messages"].append(("warning", f"Could not parse task number from filename: '{filename}'. Skipping.", None))
+            return entry
+
+        if self.lazy:
+            metadata, entry["messages"] = _read_task_metadata(filename, raw_source)
+            if metadata is None:
+                return entry
+            module = None
+            docstring = metadata["docstring"]
+            run_function = get_input_params_function = None
+            has_input_params = metadata["has_input_params"]
+            input_params = metadata["input_params"]
+            output_limits = metadata["output_limits"]
+            cacheable = metadata["cacheable"]
+            latency_slo = metadata["latency_slo"]
+        else:
+            module, entry["messages"] = _exec_task_module(filename, file_path)
+            if module is None:
+                return entry
+            docstring = inspect.getdoc(module) or "No description available."
+            run_function = module.run_task
+            get_input_params_function = getattr(module, "get_input_params", None)
+            has_input_params = get_input_params_function is not None
+            input_params = None
+            output_limits = getattr(module, "OUTPUT_LIMITS", None)
+            cacheable = getattr(module, "CACHEABLE", True)
+            latency_slo = getattr(module, "LATENCY_SLO_SECONDS", None)
+
+        entry["task_name"] = make_task_title(docstring, task_number, task_number_str, module_name)
+        entry["task_data"] = {
+            "module": module, # None until import_task() in lazy mode
+            "file_name": filename,
+            "docstring": docstring,
+            "source_code": raw_source.decode("utf-8"),
+            "source_hash": content_hash,
+            "run_function": run_function,
+            "get_input_params_function": get_input_params_function,
+            "has_input_params": has_input_params,
+            "input_params": input_params, # Static get_input_params() result, when it is a plain literal
+            "output_limits": output_limits, # The task's OUTPUT_LIMITS, or None for tasks.utils.DEFAULT_OUTPUT_LIMITS
+            "cacheable": cacheable, # False if the task sets CACHEABLE = False (output depends on earlier runs)
+            "latency_slo": latency_slo # The task's LATENCY_SLO_SECONDS: seconds for "execute", or {phase: seconds}
+        }
+        return entry
+
+
+def _exec_task_module(filename, file_path):
+    """
+    Imports a task file. Returns (module, messages); module is None on failure.
+    """
+    module_name = filename[:-3]
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    if not (spec and spec.loader):
+        return None, [("warning", f"Could not load module specification for '{filename}'. Skipping.", None)]
+
+    module = importlib.util.module_from_spec(spec)
+    # Registered under its file name like a regular import, so pickle can find the module's functions
+    # (e.g. for a task's own process pool). A module of that name from anywhere else is never replaced.
+    previous = sys.modules.get(module_name)
+    register = previous is None or _same_file(getattr(previous, "__file__", None), file_path)
+    if register:
+        sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception as e:
+        if register:
+            _restore_module(module_name, previous)
+        return None, [("error", f"Error loading module {module_name}: {e}", traceback.format_exc())]
+
+    if not (hasattr(module, "run_task") and callable(module.run_task)):
+        if register:
+            _restore_module(module_name, previous)
+        return None, [("warning", f"Module '{module_name}' does not have a callable 'run_task' function. Skipping.", None)]
+    return module, []
+
+
+def _same_file(path, other_path):
+    return path is not None and os.path.abspath(path) == os.path.abspath(other_path)
+
+def _restore_module(module_name, previous):
+    if previous is None:
+        sys.modules.pop(module_name, None)
+    else:
+        sys.modules[module_name] = previous
+
+
+def _read_task_metadata(filename, raw_source):
+    """
+    Reads a task file's metadata from its AST without executing it.
+    Returns (metadata, messages); metadata is None if the file is not a usable task.
+    """
+    module_name = filename[:-3]
+    try:
+        tree = ast.parse(raw_source, filename=filename)
+    except SyntaxError as e:
+        return None, [("error", f"Error loading module {module_name}: {e}", traceback.format_exc())]
+
+    functions = {node.name: node for node in tree.body if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))}
+    if "run_task" not in functions:
+        return None, [("warning", f"Module '{module_name}' does not have a callable 'run_task' function. Skipping.", None)]
+
+    metadata = {
+        "docstring": ast.get_docstring(tree) or "No description available.",
+        "has_input_params": "get_input_params" in functions,
+        "input_params": None,
+        "output_limits": _module_constant(tree, "OUTPUT_LIMITS"),
+        "cacheable": _module_constant(tree, "CACHEABLE", default=True),
+        "latency_slo": _module_constant(tree, "LATENCY_SLO_SECONDS"),
+    }
+    if metadata["has_input_params"]:
+        metadata["input_params"] = _literal_return_value(functions["get_input_params"])
+    return metadata, []
+
+
+def _module_constant(tree, name, default=None):
+    # Value of a top-level 'NAME = <literal>' assignment, or default
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == name for t in node.targets):
+            try:
+                return ast.literal_eval(node.value)
+            except ValueError:
+                return default
+    return default
+
+
+def _literal_return_value(function_node):
+    # Only 'def f(): return <literal>' qualifies; anything computed needs the real import
+    body = function_node.body
+    if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) and isinstance(body[0].value.value, str):
+        body = body[1:] # Skip the docstring
+    if len(body) != 1 or not isinstance(body[0], ast.Return) or body[0].value is None:
+        return None
+    try:
+        return ast.literal_eval(body[0].value)
+    except ValueError:
+        return None
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+def get_registry(task_dir, lazy=False):
+    """
+    Returns the shared TaskRegistry for task_dir (one per process, survives Streamlit reruns).
+    """
+    key = (os.path.abspath(task_dir), lazy)
+    with _registries_lock:
+        if key not in _registries:
+            _registries[key] = TaskRegistry(task_dir, lazy=lazy)
+        return _registries[key]
@@ -0,0 +1,75 @@
+import collections
+import sys
+import threading
+
+
+class ResultCache:
+    """
+    LRU cache of task outputs keyed by (module source hash, normalized run_task params).
+    Evicts least recently used entries once either max_entries or max_bytes is exceeded.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = collections.OrderedDict() # key -> output, oldest first
+        self._sizes = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(source_hash, task_params):
+        # repr() keeps 10 and 10.0 apart: tasks print them differently
+        normalized = tuple(sorted((name, repr(value)) for name, value in task_params.items()))
+        return (source_hash, normalized)
+
+    def get(self, key):
+        """
+        Returns the cached output for key, or None on a miss.
+        """
+        with self._lock:
+            output = self._entries.get(key)
+            if output is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return output
+
+    def put(self, key, output):
+        size = sys.getsizeof(output)
+        with self._lock:
+            if size > self.max_bytes:
+                return # Would evict everything else and still not fit
+            if key in self._entries:
+                self._total_bytes -= self._sizes[key]
+            self._entries[key] = output
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            self._total_bytes += size
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                old_key, _ = self._entries.popitem(last=False)
+                self._total_bytes -= self._sizes.pop(old_key)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._total_bytes,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+def get_result_cache():
+    """
+    Returns the process-wide ResultCache shared by all sessions.
+    """
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = ResultCache()
+        return _result_cache
@@ -5,48 +5,560 @@ Instance methods are functions defined inside a class that operate on an object'
 instance attributes (using `self`). They define an object's behaviors.
 Let's design a 'Playlist' that can add songs, remove songs, and play.
 """
+import math
+import random
+import weakref
+from array import array
+from collections import deque
+from collections.abc import Sequence
+from itertools import islice
+
+MAX_RATING = 5 # Ratings are whole stars, 0-5, stored in one byte per song
+
+def _checked_rating(rating):
+    if not isinstance(rating, int) or not 0 <= rating <= MAX_RATING:
+        raise ValueError(f"Rating must be a whole number of stars from 0 to {MAX_RATING}, not {rating!r}.")
+    return rating
 
 class Song: # Helper class for this task
-    def __init__(self, title, artist):
+    __slots__ = ("title", "artist", "rating", "play_count") # No per-object __dict__
+
+    def __init__(self, title, artist, rating=3, play_count=0):
         self.title = title
         self.artist = artist
+        self.rating = rating # 0-5 stars; 0 means never pick it in a rating-weighted shuffle
+        self.play_count = play_count
     def __str__(self):
         return f"'{self.title}' by {self.artist}"
 
+class SongView:
+    """
+    A song stored in a Playlist's columns, created when it is accessed. Reads and writes go
+    straight to the columns, so `song.play_count += 1` also updates the playlist's shuffle weights.
+    If the song is removed from the playlist, the view keeps a detached copy of its values.
+    """
+    __slots__ = ("_playlist", "_slot", "_song", "__weakref__")
+
+    def __init__(self, playlist, slot):
+        self._playlist = playlist
+        self._slot = slot
+        self._song = None # Detached copy, once the song has left the playlist
+
+    def _detach(self):
+        playlist, slot = self._playlist, self._slot
+        self._song = Song(playlist._titles[slot], playlist._artists[playlist._artist_ids[slot]],
+                          playlist._ratings[slot], playlist._play_counts[slot])
+        self._playlist = None
+
+    @property
+    def title(self):
+        return self._song.title if self._playlist is None else self._playlist._titles[self._slot]
+
+    @property
+    def artist(self):
+        if self._playlist is None:
+            return self._song.artist
+        return self._playlist._artists[self._playlist._artist_ids[self._slot]]
+
+    @property
+    def rating(self):
+        return self._song.rating if self._playlist is None else self._playlist._ratings[self._slot]
+
+    @rating.setter
+    def rating(self, value):
+        _checked_rating(value)
+        if self._playlist is None:
+            self._song.rating = value
+        else:
+            self._playlist._ratings[self._slot] = value
+            self._playlist._slot_changed(self._slot)
+
+    @property
+    def play_count(self):
+        return self._song.play_count if self._playlist is None else self._playlist._play_counts[self._slot]
+
+    @play_count.setter
+    def play_count(self, value):
+        if self._playlist is None:
+            self._song.play_count = value
+        else:
+            self._playlist._play_counts[self._slot] = value
+            self._playlist._slot_changed(self._slot)
+
+    def __str__(self):
+        return f"'{self.title}' by {self.artist}"
+
+class WeightedSampler:
+    """
+    Draws keys with probability proportional to their weight.
+    Keys live in buckets of weights within a power of two ([2**(e-1), 2**e)), so a draw picks a
+    bucket by its total and then a key inside it by rejection, accepted with probability >= 1/2.
+    Draws and weight updates are O(1) expected (one bucket per power of two in use).
+    """
+
+    def __init__(self):
+        self._buckets = {} # exponent -> [keys]
+        self._bucket_totals = {} # exponent -> sum of the bucket's weights
+        self._weights = {} # key -> weight
+        self._index = {} # key -> position in its bucket's list
+        self.total = 0
+
+    def __len__(self):
+        return len(self._weights)
+
+    def set(self, key, weight): # weight <= 0 removes the key
+        self.discard(key)
+        if weight <= 0:
+            return
+        exponent = math.frexp(weight)[1]
+        bucket = self._buckets.setdefault(exponent, [])
+        self._index[key] = len(bucket)
+        bucket.append(key)
+        self._bucket_totals[exponent] = self._bucket_totals.get(exponent, 0) + weight
+        self._weights[key] = weight
+        self.total += weight
+
+    def discard(self, key):
+        weight = self._weights.pop(key, None)
+        if weight is None:
+            return
+        exponent = math.frexp(weight)[1]
+        bucket = self._buckets[exponent]
+        i = self._index.pop(key)
+        last = bucket.pop() # Swap-remove: move the last key into the hole
+        if last != key:
+            bucket[i] = last
+            self._index[last] = i
+        self.total -= weight
+        if bucket:
+            self._bucket_totals[exponent] -= weight
+        else:
+            del self._buckets[exponent], self._bucket_totals[exponent]
+        if not self._weights:
+            self.total = 0 # Don't let float rounding leave a phantom total behind
+
+    def draw(self, rng=random):
+        if not self._weights:
+            raise IndexError("Cannot draw from an empty sampler.")
+        target = rng.random() * self.total
+        for exponent, bucket_total in self._bucket_totals.items():
+            if target < bucket_total:
+                break
+            target -= bucket_total # Float rounding can run past the end: the last bucket is used then
+        bucket = self._buckets[exponent]
+        upper = math.ldexp(1.0, exponent)
+        while True:
+            key = bucket[int(rng.random() * len(bucket))]
+            if rng.random() * upper < self._weights[key]:
+                return key
+
+class PlaylistSongs(Sequence):
+    """
+    Playlist.songs: a live list-like view of the songs in play order (nothing is copied).
+    Like the list it replaces, append(), extend(), remove(), pop(), del and clear() change the
+    playlist itself. Songs can't be inserted or replaced in the middle: that raises TypeError.
+    """
+    __slots__ = ("_playlist",)
+
+    def __init__(self, playlist):
+        self._playlist = playlist
+
+    def __len__(self):
+        return self._playlist.song_count()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._playlist.song_at(position) for position in range(*index.indices(len(self)))]
+        return self._playlist.song_at(index)
+
+    def __iter__(self):
+        return self._playlist.iter_songs()
+
+    def append(self, song):
+        self._playlist._append(song.title, song.artist, song.rating, song.play_count)
+
+    def extend(self, songs):
+        for song in songs:
+            self.append(song)
+
+    def __delitem__(self, index):
+        playlist = self._playlist
+        playlist.song_at(index) # Raises IndexError for a position that doesn't exist
+        playlist._remove_slot(playlist._slot_of(index % len(self)))
+
+    def pop(self, index=-1):
+        song = self[index]
+        del self[index] # The view detaches and keeps its values
+        return song
+
+    def remove(self, song):
+        # The song itself if it is one of this playlist's views, else the first with the same title and artist
+        playlist = self._playlist
+        if isinstance(song, SongView) and song._playlist is playlist:
+            playlist._remove_slot(song._slot)
+            return
+        for position, candidate in enumerate(self):
+            if candidate.title == song.title and candidate.artist == song.artist:
+                del self[position]
+                return
+        raise ValueError(f"{song} is not in playlist '{playlist.name}'.")
+
+    def clear(self):
+        while len(self):
+            del self[-1]
+
+    def __setitem__(self, index, song):
+        raise TypeError("Playlist songs keep their play order; remove() and append() songs instead of replacing them.")
+
+    def insert(self, index, song):
+        raise TypeError("Playlist songs can only be appended; use append() or Playlist.add_song().")
+
+    def __repr__(self):
+        return f"PlaylistSongs({self._playlist.name!r}, {len(self)} songs)"
+
+
 class Playlist:
+    COMPACT_MIN_SLOTS = 64 # Don't bother compacting tiny playlists
+
     def __init__(self, playlist_name):
         self.name = playlist_name
-        self.songs = [] # Instance attribute: a list to hold Song objects
+        # Songs are stored as columns, one entry per slot in play order; no Song object per song
+        self._titles = [] # A removed song leaves None behind
+        self._artist_ids = array("I") # Index into _artists: each artist name is stored once
+        self._ratings = array("B")
+        self._play_counts = array("I")
+        self._artists = []
+        self._artist_codes = {} # artist name -> index in _artists
+        self._views = {} # slot -> weakref to the SongView handed out for it (dead refs are purged now and then)
+        self._views_purge_at = 1024
+        self._title_index = {} # casefolded title -> slot, or a deque of slots (oldest first) for duplicates
+        self._removed = 0 # Number of None slots
+        self._live_tree = None # Fenwick tree counting live slots, built on the first lookup that needs it
+        self._epoch = 0 # Bumped on compaction, which renumbers the slots (and invalidates cursors' slots)
+        self._samplers = {} # "rating" / "play_count" -> WeightedSampler over slots, built on first use
+        self._rng = random.Random()
         print(f"Playlist '{self.name}' created.")
 
-    def add_song(self, title, artist): # Instance method
-        new_song = Song(title, artist)
-        self.songs.append(new_song)
-        print(f"Added {new_song} to '{self.name}'.")
+    @property
+    def songs(self): # Live list-like view of the songs in play order (see PlaylistSongs)
+        return PlaylistSongs(self)
 
-    def remove_song(self, title_to_remove): # Instance method
-        song_found = None
-        for song in self.songs:
-            if song.title.lower() == title_to_remove.lower():
-                song_found = song
-                break
-        if song_found:
-            self.songs.remove(song_found)
-            print(f"Removed '{song_found.title}' from '{self.name}'.")
+    def _song(self, slot):
+        # One view per slot at a time, so the same song is always the same object while it is in use
+        ref = self._views.get(slot)
+        view = ref() if ref is not None else None
+        if view is None:
+            view = SongView(self, slot)
+            self._views[slot] = weakref.ref(view)
+            if len(self._views) > self._views_purge_at: # Amortized O(1): the limit doubles with the live views
+                self._views = self._live_views()
+                self._views_purge_at = max(1024, 2 * len(self._views))
+        return view
+
+    def _live_views(self):
+        return {slot: ref for slot, ref in self._views.items() if ref() is not None}
+
+    def _index_title(self, title, slot):
+        key = title.casefold()
+        if key == title:
+            key = title # Share the title string instead of keeping an equal copy in the index
+        positions = self._title_index.get(key)
+        if positions is None:
+            self._title_index[key] = slot # Most titles are unique: a plain int is much smaller than a deque
+        elif isinstance(positions, int):
+            self._title_index[key] = deque((positions, slot))
         else:
+            positions.append(slot)
+
+    def _append(self, title, artist, rating=3, play_count=0):
+        _checked_rating(rating) # Before any column changes
+        slot = len(self._titles)
+        self._index_title(title, slot)
+        artist_id = self._artist_codes.get(artist)
+        if artist_id is None:
+            artist_id = self._artist_codes[artist] = len(self._artists)
+            self._artists.append(artist)
+        self._titles.append(title)
+        self._artist_ids.append(artist_id)
+        self._ratings.append(rating)
+        self._play_counts.append(play_count)
+        if self._live_tree is not None:
+            self._tree_append()
+        for weight_by, sampler in self._samplers.items():
+            sampler.set(slot, self._weight(slot, weight_by))
+
+    def add_song(self, title, artist, rating=3): # Instance method
+        self._append(title, artist, rating)
+        print(f"Added {Song(title, artist)} to '{self.name}'.")
+
+    def add_songs(self, songs): # Bulk version of add_song: (title, artist[, rating]) tuples or songs, one message
+        count = 0
+        for song in songs:
+            if isinstance(song, (Song, SongView)):
+                self._append(song.title, song.artist, song.rating, song.play_count)
+            else:
+                self._append(*song)
+            count += 1
+        print(f"Added {count} songs to '{self.name}'.")
+        return count
+
+    def find_song(self, title): # The first song with this title (any case), or None
+        positions = self._title_index.get(title.casefold())
+        if positions is None:
+            return None
+        return self._song(positions if isinstance(positions, int) else positions[0])
+
+    def remove_song(self, title_to_remove): # Instance method
+        key = title_to_remove.casefold()
+        positions = self._title_index.get(key)
+        if positions is None:
             print(f"Song '{title_to_remove}' not found in '{self.name}'.")
+            return
+        # Duplicates are removed oldest first, like a front-to-back search
+        title_found = self._remove_slot(positions if isinstance(positions, int) else positions[0])
+        print(f"Removed '{title_found}' from '{self.name}'.")
+
+    def _remove_slot(self, slot): # Returns the removed song's title
+        key = self._titles[slot].casefold()
+        positions = self._title_index[key]
+        if isinstance(positions, int):
+            del self._title_index[key]
+        else:
+            positions.remove(slot) # O(1) for the oldest, which is what remove_song() takes
+            if len(positions) == 1:
+                self._title_index[key] = positions[0]
+        ref = self._views.pop(slot, None)
+        view = ref() if ref is not None else None
+        if view is not None:
+            view._detach() # Whoever holds the song keeps its values
+        title = self._titles[slot]
+        self._titles[slot] = None
+        self._removed += 1
+        if self._live_tree is not None:
+            self._tree_add(slot, -1)
+        for sampler in self._samplers.values():
+            sampler.discard(slot)
+        if self._removed > self.COMPACT_MIN_SLOTS and self._removed * 2 > len(self._titles):
+            self._compact()
+        return title
+
+    def _compact(self):
+        # Drops the None slots and renumbers the index; amortized O(1) per removal
+        live = [slot for slot, title in enumerate(self._titles) if title is not None]
+        views = self._live_views()
+        columns = (self._titles, self._artist_ids, self._ratings, self._play_counts)
+        self._titles = [columns[0][slot] for slot in live]
+        self._artist_ids = array("I", (columns[1][slot] for slot in live))
+        self._ratings = array("B", (columns[2][slot] for slot in live))
+        self._play_counts = array("I", (columns[3][slot] for slot in live))
+        self._views = {}
+        self._title_index = {}
+        for new_slot, old_slot in enumerate(live):
+            ref = views.get(old_slot)
+            view = ref() if ref is not None else None
+            if view is not None: # Songs already handed out follow their data to the new slot
+                view._slot = new_slot
+                self._views[new_slot] = ref
+            self._index_title(self._titles[new_slot], new_slot)
+        self._removed = 0
+        self._live_tree = None
+        self._samplers = {} # Keyed by slot: rebuilt on next use
+        self._epoch += 1
+
+    # --- Positions <-> slots. With no removals they are the same; otherwise a Fenwick tree
+    # over the slots (1 = live, 0 = removed) answers both in O(log n).
+    def _tree(self):
+        if self._live_tree is None:
+            tree = [0] + [0 if title is None else 1 for title in self._titles] # 1-based
+            for i in range(1, len(tree)): # O(n) bottom-up build
+                parent = i + (i & -i)
+                if parent < len(tree):
+                    tree[parent] += tree[i]
+            self._live_tree = tree
+        return self._live_tree
+
+    def _tree_add(self, slot, delta):
+        tree = self._live_tree
+        i = slot + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _tree_append(self):
+        # The new node covers slots (i - lowbit(i), i]: itself (live) plus the children already in the tree
+        tree = self._live_tree
+        i = len(tree)
+        tree.append(1 + self._live_before(i - 1) - self._live_before(i - (i & -i)))
+
+    def _live_before(self, slot): # Live songs in slots [0, slot)
+        if not self._removed:
+            return slot
+        tree = self._tree()
+        count, i = 0, slot
+        while i > 0:
+            count += tree[i]
+            i -= i & -i
+        return count
+
+    def _slot_of(self, position): # Slot of the live song at 0-based position
+        if not self._removed:
+            return position
+        tree = self._tree()
+        slot, remaining = 0, position + 1
+        step = 1 << (len(tree).bit_length() - 1)
+        while step:
+            if slot + step < len(tree) and tree[slot + step] < remaining:
+                slot += step
+                remaining -= tree[slot]
+            step >>= 1
+        return slot
 
-    def play_playlist(self): # Instance method
-        if not self.songs:
+    def song_at(self, position): # 0-based position in play order; negative counts from the end
+        count = self.song_count()
+        if position < 0:
+            position += count
+        if not 0 <= position < count:
+            raise IndexError(f"Playlist '{self.name}' has no song at position {position}.")
+        return self._song(self._slot_of(position))
+
+    def _walk(self, slot, position):
+        # Yields (position, slot, song) from `slot` on, touching only the songs actually consumed
+        epoch = self._epoch
+        while True:
+            if epoch != self._epoch: # Compacted while we were paused: find our place again
+                epoch = self._epoch
+                slot = self._slot_of(position) if position < self.song_count() else len(self._titles)
+            if slot >= len(self._titles):
+                return
+            if self._titles[slot] is not None:
+                yield position, slot, self._song(slot)
+                position += 1
+            slot += 1
+
+    def _resolve_cursor(self, cursor):
+        # A cursor is a 0-based position, or the (slot, epoch, position) tuple play_playlist() returns
+        if cursor is None:
+            return 0, 0
+        if isinstance(cursor, int):
+            position = max(cursor, 0)
+            return (self._slot_of(position) if position < self.song_count() else len(self._titles)), position
+        slot, epoch, position = cursor
+        if epoch == self._epoch: # Same slots: resume exactly where we stopped, even after removals before it
+            return slot, self._live_before(slot)
+        return self._resolve_cursor(position)
+
+    def iter_songs(self, start=0): # Lazily yields the songs in play order, from 0-based position start
+        for _, _, song in self._walk(*self._resolve_cursor(start)):
+            yield song
+
+    def page(self, page_index, page_size): # The songs on 0-based page page_index
+        return list(islice(self.iter_songs(page_index * page_size), page_size))
+
+    def play_playlist(self, page_size=None, cursor=None): # Instance method
+        """
+        Plays the whole playlist, or only page_size songs starting at cursor.
+        Returns a cursor for the next page, or None once the playlist is finished.
+        """
+        total = self.song_count()
+        if not total:
             print(f"Playlist '{self.name}' is empty. Add some songs!")
-            return
-        print(f"\n--- Playing Playlist: {self.name} ---")
-        for i, song in enumerate(self.songs):
-            print(f"Now Playing ({i+1}/{len(self.songs)}): {song}")
+            return None
+        slot, position = self._resolve_cursor(cursor)
+        if position == 0:
+            print(f"\n--- Playing Playlist: {self.name} ---")
+        else:
+            print(f"\n--- Resuming Playlist: {self.name} at song {position + 1} ---")
+        shown = 0
+        for position, slot, song in self._walk(slot, position):
+            if page_size is not None and shown == page_size:
+                print(f"--- {total - position} more songs: continue from the returned cursor ---")
+                return (slot, self._epoch, position)
+            print(f"Now Playing ({position + 1}/{total}): {song}")
+            shown += 1
         print("--- Playlist finished ---")
+        return None
 
     def song_count(self): # Instance method
-        return len(self.songs)
+        return len(self._titles) - self._removed
+
+    # --- Shuffle and weighted play ---
+    def _weight(self, slot, weight_by):
+        if weight_by == "rating":
+            return self._ratings[slot]
+        return self._play_counts[slot] + 1 # "play_count": favourites come up more, unplayed songs still can
+
+    def _sampler(self, weight_by):
+        if weight_by not in ("rating", "play_count"):
+            raise ValueError(f"Unknown weighting '{weight_by}'. Use 'rating' or 'play_count'.")
+        sampler = self._samplers.get(weight_by)
+        if sampler is None:
+            sampler = self._samplers[weight_by] = WeightedSampler()
+            for slot, title in enumerate(self._titles):
+                if title is not None:
+                    sampler.set(slot, self._weight(slot, weight_by))
+        return sampler
+
+    def _slot_changed(self, slot):
+        # Called by SongView setters: keeps the weights in step with the columns, O(1) per sampler
+        for weight_by, sampler in self._samplers.items():
+            sampler.set(slot, self._weight(slot, weight_by))
+
+    def rate_song(self, title, rating):
+        song = self.find_song(title)
+        if song is None:
+            print(f"Song '{title}' not found in '{self.name}'.")
+            return
+        song.rating = rating # Updates the shuffle weights through the SongView
+        print(f"Rated {song} {rating}/5.")
+
+    def record_play(self, song):
+        song.play_count += 1
+
+    def pick_song(self, weight_by="rating"): # One random song, weighted by "rating" or "play_count"
+        sampler = self._sampler(weight_by)
+        return self._song(sampler.draw(self._rng)) if len(sampler) else None
+
+    def shuffled(self, seed=None):
+        """
+        Lazily yields every song once in random order (Fisher-Yates over the slots).
+        Only the swapped slots are remembered, so nothing is copied up front.
+        """
+        rng = random.Random(seed) if seed is not None else self._rng
+        epoch, remaining = self._epoch, len(self._titles)
+        swapped = {} # i -> slot currently at shuffle index i, for the indexes that moved
+        while remaining:
+            if epoch != self._epoch:
+                raise RuntimeError(f"Playlist '{self.name}' was compacted during the shuffle.")
+            i = int(rng.random() * remaining)
+            remaining -= 1
+            slot = swapped.get(i, i)
+            swapped[i] = swapped.pop(remaining, remaining)
+            if self._titles[slot] is not None: # Removed songs are skipped; compaction keeps them under half the slots
+                yield self._song(slot)
+
+    def play_queue(self, count, weight_by=None, seed=None):
+        """
+        Plays count songs: a no-repeat shuffle, or weighted random picks (repeats allowed)
+        by "rating" or "play_count". Every song played counts towards its play_count.
+        """
+        if not self.song_count():
+            print(f"Playlist '{self.name}' is empty. Add some songs!")
+            return
+        if seed is not None:
+            self._rng.seed(seed)
+        if weight_by is None:
+            count = min(count, self.song_count()) # No repeats: at most every song once
+            print(f"\n--- Shuffling {self.name} ---")
+            songs = islice(self.shuffled(), count)
+        else:
+            print(f"\n--- Playing {self.name}, weighted by {weight_by.replace('_', ' ')} ---")
+            songs = (self.pick_song(weight_by) for _ in range(count))
+        for number, song in enumerate(songs, start=1):
+            if song is None: # Every weight is zero (e.g. no song is rated)
+                print("No song can be picked with this weighting.")
+                break
+            self.record_play(song)
+            print(f"Now Playing ({number}/{count}): {song} - {song.rating}/5, played {song.play_count}x")
 
 def get_input_params():
     return [
@@ -55,10 +567,16 @@ def get_input_params():
         {"name": "song1_artist", "label": "Song 1 Artist:", "type": "text_input", "default": "Queen"},
         {"name": "song2_title", "label": "Song 2 Title:", "type": "text_input", "default": "Stairway to Heaven"},
         {"name": "song2_artist", "label": "Song 2 Artist:", "type": "text_input", "default": "Led Zeppelin"},
-        {"name": "song_to_remove", "label": "Song Title to Remove (try one you added):", "type": "text_input", "default": "Bohemian Rhapsody"}
+        {"name": "song_to_remove", "label": "Song Title to Remove (try one you added):", "type": "text_input", "default": "Bohemian Rhapsody"},
+        {"name": "extra_songs", "label": "Extra generated songs (try 1000000):", "type": "number_input", "default": 0, "step": 1, "format": "%d", "min_value": 0, "max_value": 1_000_000},
+        {"name": "page_size", "label": "Songs per page:", "type": "slider", "default": 10, "min_value": 1, "max_value": 100, "step": 1},
+        {"name": "page_number", "label": "Page to play:", "type": "number_input", "default": 1, "step": 1, "format": "%d", "min_value": 1},
+        {"name": "queue_mode", "label": "Play queue:", "type": "selectbox", "options": ["shuffle", "rating", "play_count"], "default": "shuffle"},
+        {"name": "shuffle_seed", "label": "Shuffle seed (same seed, same order):", "type": "number_input", "default": 42, "step": 1, "format": "%d"}
     ]
 
-def run_task(p_name, song1_title, song1_artist, song2_title, song2_artist, song_to_remove):
+def run_task(p_name, song1_title, song1_artist, song2_title, song2_artist, song_to_remove,
+             extra_songs=0, page_size=10, page_number=1, queue_mode="shuffle", shuffle_seed=42):
     my_playlist = Playlist(p_name)
 
     print("\n--- Adding songs using instance methods ---")
@@ -66,17 +584,28 @@ def run_task(p_name, song1_title, song1_artist, song2_title, song2_artist, song_
         my_playlist.add_song(song1_title, song1_artist)
     if song2_title and song2_artist:
         my_playlist.add_song(song2_title, song2_artist)
-    my_playlist.add_song("Imagine", "John Lennon") # Add a fixed one for variety
+    my_playlist.add_song("Imagine", "John Lennon", rating=5) # Add a fixed one for variety
+    if extra_songs:
+        my_playlist.add_songs((f"Generated Song {i + 1}", "Lab Bot", i % 5 + 1) for i in range(int(extra_songs)))
 
     print(f"\nPlaylist '{my_playlist.name}' now has {my_playlist.song_count()} songs.")
 
-    my_playlist.play_playlist()
+    # Only one page is formatted and printed, however long the playlist is
+    page_size = int(page_size)
+    cursor = my_playlist.play_playlist(page_size=page_size, cursor=(int(page_number) - 1) * page_size)
+    if cursor is not None:
+        print("\n--- Resuming from the cursor for one more song ---")
+        my_playlist.play_playlist(page_size=1, cursor=cursor)
 
     print(f"\n--- Removing a song: '{song_to_remove}' ---")
     my_playlist.remove_song(song_to_remove)
     my_playlist.remove_song("Non Existent Song") # Try removing one not there
 
-    my_playlist.play_playlist()
+    my_playlist.play_playlist(page_size=page_size)
+
+    # Weighted picks are O(1) each, however long the playlist is
+    my_playlist.rate_song("Imagine", 5)
+    my_playlist.play_queue(5, weight_by=None if queue_mode == "shuffle" else queue_mode, seed=int(shuffle_seed))
 
 if __name__ == "__main__":
     run_task("Rock Classics", "Hotel California", "Eagles", "Kashmir", "Led Zeppelin", "Kashmir")
\ No newline at end of file
@@ -6,6 +6,9 @@ Modifying a class attribute affects all objects of that class.
 Let's make pizzas and see how a shared setting (like baking temperature) applies to all.
 """
 
+# run_task prints class attributes left over from earlier runs, so its output must not be reused
+CACHEABLE = False
+
 class Pizza:
     # Class attributes
     default_oven_temperature_celsius = 220  # Shared by all pizzas
@@ -6,6 +6,9 @@ Class methods are bound to the class (not an instance). They receive the class
 or modifying class state. Let's manage a 'SoftwareLicense' pool.
 """
 
+# Every run mutates SoftwareLicense's class-level counter and type list; don't serve it from the result cache
+CACHEABLE = False
+
 class SoftwareLicense:
     # Class attribute
     total_licenses_issued = 0
@@ -5,52 +5,570 @@ Encapsulation bundles data and methods, restricting direct access to some compon
 Experiment with a bank account: deposit and withdraw funds.
 _protected (convention), __private (name mangling).
 """
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import ExitStack
+from heapq import nlargest
+from itertools import accumulate, chain, compress, count, islice, repeat
+
+class TransactionLedger:
+    """
+    Transaction history stored as typed arrays: a fixed 33 bytes per transaction
+    (id, kind, amount and running balance in integer cents, timestamp in ns) instead of
+    one string each. Entries are only formatted when someone looks at them.
+    """
+    DEPOSIT, WITHDRAWAL, TRANSFER_OUT, TRANSFER_IN = 0, 1, 2, 3
+    KIND_LABELS = ("Deposited", "Withdrew", "Transferred out", "Transferred in")
+
+    def __init__(self):
+        self.txn_ids = array("Q")
+        self.kinds = array("B")
+        self.amounts = array("q") # Cents
+        self.balances = array("q") # Cents, after the transaction
+        self.timestamps = array("q") # time.time_ns(), strictly increasing
+        self._amount_indexes = {} # kind -> AmountIndex, built by the first query that needs it
+
+    def __len__(self):
+        return len(self.txn_ids)
+
+    def columns(self):
+        return self.txn_ids, self.kinds, self.amounts, self.balances, self.timestamps
+
+    def next_timestamp(self): # Strictly after the last one recorded, even if the clock went back
+        now = time.time_ns()
+        return max(now, self.timestamps[-1] + 1) if self.timestamps else now
+
+    def append(self, txn_id, kind, amount_cents, balance_cents, timestamp_ns):
+        self.txn_ids.append(txn_id)
+        self.kinds.append(kind)
+        self.amounts.append(amount_cents)
+        self.balances.append(balance_cents)
+        self.timestamps.append(timestamp_ns)
+
+    def extend(self, txn_ids, kinds, amounts_cents, balances_cents, timestamps_ns): # Columns of a batch
+        for column, values in zip(self.columns(), (txn_ids, kinds, amounts_cents, balances_cents, timestamps_ns)):
+            column.extend(values)
+
+    def format_entry(self, i):
+        return f"TXN{self.txn_ids[i]:04d}: {self.KIND_LABELS[self.kinds[i]]} ${self.amounts[i] / 100:.2f}"
+
+    def total(self, kind): # Sum of one kind of transaction, in cents
+        return sum(compress(self.amounts, (k == kind for k in self.kinds)))
+
+    def entry(self, i):
+        return {"txn_id": self.txn_ids[i], "kind": self.KIND_LABELS[self.kinds[i]], "amount": self.amounts[i] / 100,
+                "balance": self.balances[i] / 100, "timestamp_ns": self.timestamps[i]}
+
+    # --- Queries: ids and timestamps only ever grow, so both columns are already sorted for bisect,
+    # and the balance column is the running (prefix) sum of the amounts.
+    def id_range(self, first_id, last_id): # Positions of txn ids first_id..last_id (inclusive), as a range
+        return range(bisect_left(self.txn_ids, first_id), bisect_right(self.txn_ids, last_id))
+
+    def time_range(self, start_ns, end_ns): # Positions with start_ns <= timestamp < end_ns, as a range
+        return range(bisect_left(self.timestamps, start_ns), bisect_left(self.timestamps, end_ns))
+
+    def balance_as_of(self, txn_id): # Balance in cents right after txn_id; None if the ledger is empty
+        if not self.txn_ids:
+            return None
+        i = bisect_right(self.txn_ids, txn_id) - 1
+        if i >= 0:
+            return self.balances[i]
+        # Before the first transaction: undo it
+        inflow = self.kinds[0] in (self.DEPOSIT, self.TRANSFER_IN)
+        return self.balances[0] - self.amounts[0] if inflow else self.balances[0] + self.amounts[0]
+
+    def _amount_index(self, kind):
+        index = self._amount_indexes.get(kind)
+        if index is None:
+            index = self._amount_indexes[kind] = AmountIndex(kind)
+        index.refresh(self)
+        return index
+
+    def above(self, kind, amount_cents): # Positions of `kind` transactions larger than amount_cents, in order
+        return sorted(self._amount_index(kind).above(amount_cents))
+
+    def largest(self, k): # Positions of the k largest transactions of any kind, largest first
+        candidates = chain.from_iterable(self._amount_index(kind).largest(k) for kind in range(len(self.KIND_LABELS)))
+        return [position for _, position in nlargest(k, candidates)]
+
+
+class AmountIndex:
+    """
+    Positions of one kind of ledger entry, sorted by (amount, position), kept as a few sorted runs
+    of parallel amount/position arrays plus an unsorted tail of fewer than TAIL entries.
+    A full tail becomes a new run, merged with every run not longer than itself: there are
+    O(log n) runs, each entry is merged O(log n) times, and a query bisects every run.
+    """
+    TAIL = 64
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.runs = [] # (amounts array("q"), positions array("Q")), longest first
+        self._tail = [] # (amount, position) pairs not in a run yet
+        self._covered = 0 # Ledger entries already looked at
+
+    def refresh(self, ledger):
+        kinds, amounts = ledger.kinds, ledger.amounts
+        for i in range(self._covered, len(kinds)):
+            if kinds[i] == self.kind:
+                self._tail.append((amounts[i], i))
+        self._covered = len(kinds)
+        if len(self._tail) >= self.TAIL: # A bulk insert becomes one run, sorted once
+            self._push_tail()
+
+    def _push_tail(self):
+        run = sorted(self._tail)
+        self._tail = []
+        while self.runs and len(self.runs[-1][0]) <= len(run):
+            amounts, positions = self.runs.pop()
+            run = sorted(chain(zip(amounts, positions), run)) # Two sorted runs: linear merge
+        self.runs.append((array("q", (amount for amount, _ in run)), array("Q", (position for _, position in run))))
+
+    def above(self, amount_cents):
+        found = [positions[bisect_right(amounts, amount_cents):] for amounts, positions in self.runs]
+        found.append([position for amount, position in self._tail if amount > amount_cents])
+        return chain.from_iterable(found)
+
+    def largest(self, k): # Up to k (amount, position) pairs per run, including the k largest overall
+        found = [zip(amounts[max(len(amounts) - k, 0):], positions[max(len(positions) - k, 0):])
+                 for amounts, positions in self.runs]
+        found.append(self._tail)
+        return chain.from_iterable(found)
+
+
+def to_cents(amount):
+    return round(float(amount) * 100)
+
+
+class TransactionWAL:
+    """
+    Append-only, memory-mapped write-ahead log of fixed 40-byte records:
+    (txn id, kind, amount cents, balance cents, timestamp ns) as five little-endian int64.
+    Records become durable in groups: every `group_commit` records (or on commit()) the new records
+    are flushed, then the header's committed count. Anything after that count is ignored on open.
+
+    snapshot() appends the transactions added since the previous snapshot to the snapshot file as
+    one more segment (a block per column) and empties the log: each snapshot writes only the new
+    history, and replay stays a few memcpy's per segment plus a short log tail.
+    """
+    MAGIC = b"OOPWAL01"
+    HEADER = struct.Struct("<8sqqq") # magic, committed records, opening balance cents, txn id before the first record
+    RECORD = struct.Struct("<5q")
+    FIELDS = 5
+    SNAPSHOT_MAGIC = b"OOPSNAP1"
+    SNAPSHOT_HEADER = struct.Struct("<8sqqq") # Per segment: magic, transactions, balance cents, last txn id
+    SNAPSHOT_ROW_SIZE = 8 + 1 + 8 + 8 + 8 # Bytes per transaction in a segment: one item of each column
+
+    def __init__(self, path, opening_balance_cents=0, group_commit=64, initial_records=4096):
+        self.path = path
+        self.snapshot_path = path + ".snap"
+        self.group_commit = group_commit
+        self._snapshot_rows = self._snapshot_end = None # Transactions and valid bytes in the snapshot file, once known
+        self._file = open(path, "r+b" if os.path.exists(path) else "w+b")
+        if os.fstat(self._file.fileno()).st_size < self.HEADER.size:
+            self._file.truncate(self.HEADER.size + initial_records * self.RECORD.size)
+            self._map = mmap.mmap(self._file.fileno(), 0)
+            self._write_header(0, opening_balance_cents, 0)
+            if os.path.exists(self.snapshot_path): # Left by an earlier account: segments are only ever appended
+                os.remove(self.snapshot_path)
+            self._snapshot_rows = self._snapshot_end = 0
+        else:
+            self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, self.committed, self.opening_balance_cents, self.base_txn_id = self.HEADER.unpack_from(self._map, 0)
+        if magic != self.MAGIC:
+            self._map.close()
+            self._file.close()
+            raise ValueError(f"{path} is not a transaction log.")
+        self.count = self.committed # Records written, committed or not
+
+    def _write_header(self, committed, opening_balance_cents, base_txn_id):
+        self.HEADER.pack_into(self._map, 0, self.MAGIC, committed, opening_balance_cents, base_txn_id)
+
+    def _reserve(self, records):
+        needed = self.HEADER.size + (self.count + records) * self.RECORD.size
+        if needed > len(self._map):
+            size = len(self._map)
+            while size < needed:
+                size *= 2 # Doubling keeps remapping amortized O(1) per record
+            self._map.flush()
+            self._map.close()
+            self._file.truncate(size)
+            self._map = mmap.mmap(self._file.fileno(), 0)
+
+    def append(self, txn_id, kind, amount_cents, balance_cents, timestamp_ns):
+        self._reserve(1)
+        self.RECORD.pack_into(self._map, self.HEADER.size + self.count * self.RECORD.size,
+                              txn_id, kind, amount_cents, balance_cents, timestamp_ns)
+        self.count += 1
+        if self.count - self.committed >= self.group_commit:
+            self.commit()
+
+    def extend(self, txn_ids, kinds, amounts_cents, balances_cents, timestamps_ns):
+        # Interleaves the batch's columns into records with strided array assignment: no per-record pack()
+        n = len(amounts_cents)
+        if not n:
+            return
+        records = array("q", bytes(8 * self.FIELDS * n))
+        for field, values in enumerate((txn_ids, kinds, amounts_cents, balances_cents, timestamps_ns)):
+            records[field::self.FIELDS] = values if isinstance(values, array) and values.typecode == "q" else array("q", values)
+        self._reserve(n)
+        start = self.HEADER.size + self.count * self.RECORD.size
+        self._map[start:start + len(records) * 8] = records.tobytes()
+        self.count += n
+        if self.count - self.committed >= self.group_commit:
+            self.commit()
+
+    def commit(self):
+        if self.count == self.committed:
+            return
+        # Records first, then the count that makes them visible: a crash in between loses only this group
+        start = self.HEADER.size + self.committed * self.RECORD.size
+        aligned = start - start % mmap.ALLOCATIONGRANULARITY
+        self._map.flush(aligned, self.HEADER.size + self.count * self.RECORD.size - aligned)
+        self._write_header(self.count, self.opening_balance_cents, self.base_txn_id)
+        self._map.flush(0, self.HEADER.size)
+        self.committed = self.count
+
+    def _snapshot_segments(self, f):
+        # (columns offset, transactions, balance cents, last txn id) of every complete segment, reading only their headers
+        size = os.fstat(f.fileno()).st_size
+        segments, offset, end = [], 0, 0
+        while offset + self.SNAPSHOT_HEADER.size <= size:
+            f.seek(offset)
+            magic, n, balance_cents, last_txn_id = self.SNAPSHOT_HEADER.unpack(f.read(self.SNAPSHOT_HEADER.size))
+            if magic != self.SNAPSHOT_MAGIC:
+                raise ValueError(f"{self.snapshot_path} is not a ledger snapshot.")
+            offset += self.SNAPSHOT_HEADER.size + n * self.SNAPSHOT_ROW_SIZE
+            if offset > size:
+                break # Torn by a crash while it was appended; its transactions are still in the log
+            segments.append((offset - n * self.SNAPSHOT_ROW_SIZE, n, balance_cents, last_txn_id))
+            end = offset
+        self._snapshot_rows, self._snapshot_end = sum(n for _, n, _, _ in segments), end
+        return segments
+
+    def replay(self):
+        """
+        Returns (ledger columns, balance cents, last txn id) from the snapshot segments plus the committed log records.
+        The log is read through memoryview casts and strided copies: no Python object per record.
+        """
+        columns = (array("Q"), array("B"), array("q"), array("q"), array("q"))
+        last_snapshot_id = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "rb") as f:
+                for offset, n, _, last_snapshot_id in self._snapshot_segments(f):
+                    f.seek(offset)
+                    for column in columns:
+                        column.fromfile(f, n)
+        else:
+            self._snapshot_rows = self._snapshot_end = 0
+        n = self.committed
+        with memoryview(self._map) as raw, raw[self.HEADER.size:self.HEADER.size + n * self.RECORD.size] as block, \
+                block.cast("q") as words:
+            fields = [words[field::self.FIELDS].tobytes() for field in range(self.FIELDS)]
+        tail = (array("Q"), array("B"), array("q"), array("q"), array("q"))
+        tail[0].frombytes(fields[0]) # Non-negative int64 and uint64 share their bytes
+        tail[1].frombytes(fields[1][::8]) # Kinds fit in the low (first, little-endian) byte
+        for column, data in zip(tail[2:], fields[2:]):
+            column.frombytes(data)
+        # A crash between writing a segment and emptying the log leaves records the snapshot already has
+        skip = bisect_right(tail[0], last_snapshot_id)
+        if not columns[0] and not skip:
+            columns = tail
+        else:
+            for column, new in zip(columns, tail):
+                column.extend(new[skip:] if skip else new)
+        if columns[0]:
+            return columns, columns[3][-1], columns[0][-1]
+        return columns, self.opening_balance_cents, self.base_txn_id
+
+    def snapshot(self, columns, balance_cents, last_txn_id):
+        # Appends the transactions since the last snapshot as a new segment (made durable first), then empties the log
+        self.commit()
+        with open(self.snapshot_path, "r+b" if os.path.exists(self.snapshot_path) else "w+b") as f:
+            if self._snapshot_rows is None:
+                self._snapshot_segments(f)
+            start = self._snapshot_rows
+            n = len(columns[0]) - start
+            if n <= 0:
+                return
+            f.truncate(self._snapshot_end) # Drops a segment torn by an earlier crash
+            f.seek(self._snapshot_end)
+            f.write(self.SNAPSHOT_HEADER.pack(self.SNAPSHOT_MAGIC, n, balance_cents, last_txn_id))
+            for column in columns:
+                with memoryview(column) as view, view[start:] as new:
+                    f.write(new)
+            f.flush()
+            os.fsync(f.fileno())
+            self._snapshot_rows, self._snapshot_end = start + n, f.tell()
+        self.opening_balance_cents, self.base_txn_id = balance_cents, last_txn_id
+        self.committed = self.count = 0
+        self._write_header(0, balance_cents, last_txn_id)
+        self._map.flush(0, self.HEADER.size)
+
+    def close(self):
+        self.commit()
+        self._map.close()
+        self._file.close()
+
 
 class BankAccount:
-    def __init__(self, account_holder, initial_balance=0):
+    _account_numbers = count(1) # next() on itertools.count is atomic, so numbers are unique across threads
+
+    def __init__(self, account_holder, initial_balance=0, wal_path=None, snapshot_every=1_000_000):
         self.account_holder = account_holder  # Public
-        self._balance = float(initial_balance) # Protected
+        self.account_number = next(BankAccount._account_numbers) # Public; also the lock order for transfers
+        self._balance_cents = to_cents(initial_balance) # Protected; whole cents, so sums stay exact
         self.__transaction_id_counter = 0     # Private
-        self.__transaction_log = []           # Private
-        print(f"Account for {self.account_holder} created with balance: ${self._balance:.2f}")
+        self.__transaction_log = TransactionLedger() # Private
+        self._lock = threading.RLock() # Protected; guards the balance, counter and log together
+        self.__wal = None # Private; TransactionWAL when the account is persistent
+        self.snapshot_every = snapshot_every # Log records before an automatic snapshot
+        if wal_path is None:
+            print(f"Account for {self.account_holder} created with balance: ${self._balance:.2f}")
+            return
+        existed = os.path.exists(wal_path)
+        self.__wal = TransactionWAL(wal_path, opening_balance_cents=self._balance_cents)
+        if not existed:
+            print(f"Account for {self.account_holder} created with balance: ${self._balance:.2f} (logged to {os.path.basename(wal_path)})")
+            return
+        columns, self._balance_cents, self.__transaction_id_counter = self.__wal.replay()
+        for column, values in zip(self.__transaction_log.columns(), columns):
+            column.extend(values)
+        print(f"Account for {self.account_holder} recovered from {os.path.basename(wal_path)}: "
+              f"{len(self.__transaction_log)} transactions, balance ${self._balance:.2f}")
 
-    def _generate_transaction_id(self): # Protected method
+    @property
+    def _balance(self): # Protected, in dollars
+        return self._balance_cents / 100
+
+    def _generate_transaction_id(self): # Protected method; call with self._lock held
         self.__transaction_id_counter += 1
-        return f"TXN{self.__transaction_id_counter:04d}"
+        return self.__transaction_id_counter
+
+    def _record(self, kind, cents, delta): # Protected; call with self._lock held
+        self._balance_cents += delta
+        txn_id = self._generate_transaction_id()
+        log = self.__transaction_log
+        timestamp = log.next_timestamp()
+        log.append(txn_id, kind, cents, self._balance_cents, timestamp)
+        if self.__wal is not None:
+            self.__wal.append(txn_id, kind, cents, self._balance_cents, timestamp)
+            self._maybe_snapshot()
+        return txn_id
+
+    def _maybe_snapshot(self): # Call with self._lock held
+        if self.__wal.count >= self.snapshot_every:
+            self.snapshot()
+
+    def snapshot(self):
+        """
+        Persistent accounts: appends the transactions since the last snapshot to the snapshot file and
+        empties the log, so the next recovery reads columns in bulk instead of replaying every record.
+        """
+        with self._lock:
+            if self.__wal is not None:
+                self.__wal.snapshot(self.__transaction_log.columns(), self._balance_cents, self.__transaction_id_counter)
+
+    def sync(self): # Persistent accounts: make every transaction so far durable (ends the commit group early)
+        with self._lock:
+            if self.__wal is not None:
+                self.__wal.commit()
+
+    def close(self):
+        with self._lock:
+            if self.__wal is not None:
+                self.__wal.close()
+                self.__wal = None
 
     def deposit(self, amount):
-        amount = float(amount)
-        if amount > 0:
-            self._balance += amount
-            txn_id = self._generate_transaction_id()
-            self.__transaction_log.append(f"{txn_id}: Deposited ${amount:.2f}")
-            print(f"Deposited ${amount:.2f}. New balance: ${self._balance:.2f}")
+        cents = to_cents(amount)
+        if cents > 0:
+            with self._lock:
+                self._record(TransactionLedger.DEPOSIT, cents, cents)
+                new_balance = self._balance
+            print(f"Deposited ${cents / 100:.2f}. New balance: ${new_balance:.2f}")
         else:
             print("Deposit amount must be positive.")
 
     def withdraw(self, amount):
-        amount = float(amount)
-        if 0 < amount <= self._balance:
-            self._balance -= amount
-            txn_id = self._generate_transaction_id()
-            self.__transaction_log.append(f"{txn_id}: Withdrew ${amount:.2f}")
-            print(f"Withdrew ${amount:.2f}. New balance: ${self._balance:.2f}")
-        elif amount > self._balance:
-            print(f"Insufficient funds. Cannot withdraw ${amount:.2f} from ${self._balance:.2f}.")
+        cents = to_cents(amount)
+        with self._lock: # The funds check and the update must see the same balance
+            balance = self._balance
+            accepted = 0 < cents <= self._balance_cents
+            if accepted:
+                self._record(TransactionLedger.WITHDRAWAL, cents, -cents)
+                balance = self._balance
+        if accepted:
+            print(f"Withdrew ${cents / 100:.2f}. New balance: ${balance:.2f}")
+        elif cents > 0:
+            print(f"Insufficient funds. Cannot withdraw ${cents / 100:.2f} from ${balance:.2f}.")
         else:
             print("Withdrawal amount must be positive.")
 
+    def _record_batch(self, kind, amounts_cents, balances_cents): # Call with self._lock held
+        n = len(amounts_cents)
+        first_id = self.__transaction_id_counter + 1
+        self.__transaction_id_counter += n
+        first_timestamp = self.__transaction_log.next_timestamp()
+        batch = (range(first_id, first_id + n), array("B", repeat(kind, n)), amounts_cents, balances_cents,
+                 range(first_timestamp, first_timestamp + n))
+        self.__transaction_log.extend(*batch)
+        self._balance_cents = balances_cents[-1]
+        if self.__wal is not None:
+            self.__wal.extend(*batch)
+            self._maybe_snapshot()
+
+    def deposit_many(self, amounts):
+        """
+        Deposits every amount as its own transaction, with a single message. All or nothing:
+        if any amount is not positive, nothing is deposited. Returns the number of deposits.
+        """
+        cents = array("q", map(to_cents, amounts))
+        if not cents:
+            return 0
+        if min(cents) <= 0:
+            print("Deposit amounts must all be positive. Nothing was deposited.")
+            return 0
+        with self._lock:
+            self._record_batch(TransactionLedger.DEPOSIT, cents, array("q", accumulate(cents, initial=self._balance_cents))[1:])
+            new_balance = self._balance
+        print(f"Deposited ${sum(cents) / 100:.2f} in {len(cents)} transactions. New balance: ${new_balance:.2f}")
+        return len(cents)
+
+    def withdraw_many(self, amounts):
+        """
+        Withdraws the amounts in order, as repeated withdraw() calls would: an amount that is not
+        positive or exceeds the balance at that point is declined. Returns the number of withdrawals.
+        """
+        cents = array("q", map(to_cents, amounts))
+        if not cents:
+            return 0
+        with self._lock:
+            if min(cents) > 0 and sum(cents) <= self._balance_cents: # Everything fits: no need to check one by one
+                accepted = cents
+                balances = array("q", accumulate(cents, lambda balance, amount: balance - amount, initial=self._balance_cents))[1:]
+            else:
+                accepted, balances = array("q"), array("q")
+                balance = self._balance_cents
+                for amount in cents:
+                    if 0 < amount <= balance:
+                        balance -= amount
+                        accepted.append(amount)
+                        balances.append(balance)
+            if accepted:
+                self._record_batch(TransactionLedger.WITHDRAWAL, accepted, balances)
+            new_balance = self._balance
+        declined = len(cents) - len(accepted)
+        print(f"Withdrew ${sum(accepted) / 100:.2f} in {len(accepted)} transactions"
+              f"{f' ({declined} declined)' if declined else ''}. New balance: ${new_balance:.2f}")
+        return len(accepted)
+
     def get_balance(self):
         return self._balance
 
-    def view_transaction_log(self):
+    # --- History queries: O(log n) lookups plus the size of the answer
+    def transactions_between_ids(self, first_id, last_id, limit=None):
+        with self._lock:
+            log = self.__transaction_log
+            return [log.entry(i) for i in islice(log.id_range(first_id, last_id), limit)]
+
+    def transactions_between_times(self, start_ns, end_ns, limit=None): # time.time_ns() values, end excluded
+        with self._lock:
+            log = self.__transaction_log
+            return [log.entry(i) for i in islice(log.time_range(start_ns, end_ns), limit)]
+
+    def withdrawals_above(self, amount):
+        with self._lock:
+            log = self.__transaction_log
+            return [log.entry(i) for i in log.above(TransactionLedger.WITHDRAWAL, to_cents(amount))]
+
+    def balance_as_of(self, txn_id): # Balance right after transaction txn_id (before the first one for 0)
+        with self._lock:
+            balance_cents = self.__transaction_log.balance_as_of(txn_id)
+            return self._balance if balance_cents is None else balance_cents / 100
+
+    def largest_transactions(self, k):
+        with self._lock:
+            log = self.__transaction_log
+            return [log.entry(i) for i in log.largest(k)]
+
+    def get_totals(self): # (total deposited, total withdrawn), summed from the ledger's cents
+        log = self.__transaction_log
+        with self._lock:
+            return log.total(TransactionLedger.DEPOSIT) / 100, log.total(TransactionLedger.WITHDRAWAL) / 100
+
+    def view_transaction_log(self, last=None): # last=N shows only the N most recent entries
         print("\n--- Transaction Log ---")
-        if not self.__transaction_log:
+        log = self.__transaction_log
+        end = len(log) # Entries are only ever appended: everything before `end` stays as it is
+        if not end:
             print("No transactions yet.")
-        for entry in self.__transaction_log:
-            print(entry)
+        start = 0 if last is None else max(end - last, 0)
+        if start:
+            print(f"... {start} earlier transactions not shown")
+        for i in range(start, end):
+            print(log.format_entry(i))
         print("-----------------------")
 
+
+class AccountRegistry:
+    """
+    Keeps accounts by account number and moves money between them.
+    A transfer locks both accounts, always lowest account number first, so two opposite
+    transfers can never wait on each other (no deadlock) and no one sees half a transfer.
+    """
+
+    def __init__(self):
+        self._accounts = {} # account_number -> BankAccount
+        self._lock = threading.Lock() # Guards the dict only
+
+    def open_account(self, account_holder, initial_balance=0):
+        return self.add(BankAccount(account_holder, initial_balance))
+
+    def add(self, account):
+        with self._lock:
+            self._accounts[account.account_number] = account
+        return account
+
+    def get(self, account_number):
+        return self._accounts[account_number]
+
+    def accounts(self):
+        with self._lock:
+            return list(self._accounts.values())
+
+    def transfer(self, src, dst, amount):
+        """
+        Atomically moves amount from src to dst (accounts or account numbers).
+        Returns (withdrawal txn id, deposit txn id), or None if the transfer was declined.
+        Prints nothing, so it can run in hot loops and worker threads; the caller reports.
+        """
+        src = src if isinstance(src, BankAccount) else self.get(src)
+        dst = dst if isinstance(dst, BankAccount) else self.get(dst)
+        cents = to_cents(amount)
+        if src is dst or cents <= 0:
+            return None
+        first, second = sorted((src, dst), key=lambda account: account.account_number)
+        with first._lock, second._lock:
+            if cents > src._balance_cents:
+                return None
+            return (src._record(TransactionLedger.TRANSFER_OUT, cents, -cents),
+                    dst._record(TransactionLedger.TRANSFER_IN, cents, cents))
+
+    def total_balance(self):
+        # Locks every account (in order) so no transfer is counted on one side only
+        accounts = sorted(self.accounts(), key=lambda account: account.account_number)
+        with ExitStack() as stack:
+            for account in accounts:
+                stack.enter_context(account._lock)
+            return sum(account._balance_cents for account in accounts) / 100
+
 def get_input_params():
     return [
         {"name": "holder_name", "label": "Account Holder Name:", "type": "text_input", "default": "Alice Wonderland"},
@@ -69,11 +587,51 @@ def run_task(holder_name, initial_deposit, deposit_amount, withdraw_amount):
     my_account.withdraw(withdraw_amount)
     my_account.withdraw(my_account.get_balance() + 100) # Attempt to overdraw
 
-    print(f"\nFinal balance via public method: ${my_account.get_balance():.2f}")
+    print("\n--- Batch transactions: one call, one message ---")
+    my_account.deposit_many([25, 50, 75])
+    my_account.withdraw_many([10, 20, my_account.get_balance() + 1]) # The last one is declined
+
+    print("\n--- Thread-safe transfers between accounts ---")
+    bank = AccountRegistry()
+    bank.add(my_account)
+    savings = bank.open_account(f"{holder_name} (savings)")
+    results = []
+    def move_ten_dollars(): # list.append is thread-safe
+        results.append(bank.transfer(my_account, savings, 10))
+    threads = [threading.Thread(target=move_ten_dollars) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"5 concurrent $10 transfers, withdrawal txn ids: {sorted(txn_ids[0] for txn_ids in results if txn_ids)}")
+    print(f"Savings balance: ${savings.get_balance():.2f}")
+    print(f"Money in the bank (unchanged by transfers): ${bank.total_balance():.2f}")
+
+    print("\n--- Persistence: write-ahead log, then recovery ---")
+    with tempfile.TemporaryDirectory() as log_dir:
+        wal_path = os.path.join(log_dir, "account.wal")
+        persistent = BankAccount(holder_name, initial_deposit, wal_path=wal_path)
+        persistent.deposit(deposit_amount)
+        persistent.withdraw(withdraw_amount)
+        persistent.close() # Commits the last group of records
+        recovered = BankAccount(holder_name, wal_path=wal_path) # Rebuilt from the log, not from initial_balance
+        recovered.view_transaction_log()
+        recovered.close()
+
+    print("\n--- Querying the history (indexed, no full scans) ---")
+    print(f"Balance right after TXN0002: ${my_account.balance_as_of(2):.2f}")
+    print(f"Withdrawals above $15.00: {[entry['txn_id'] for entry in my_account.withdrawals_above(15)]}")
+    for entry in my_account.largest_transactions(3):
+        print(f"Large movement: TXN{entry['txn_id']:04d} {entry['kind']} ${entry['amount']:.2f}")
+
+    deposited, withdrawn = my_account.get_totals()
+    print(f"\nTotal deposited: ${deposited:.2f}, total withdrawn: ${withdrawn:.2f}")
+    print(f"Final balance via public method: ${my_account.get_balance():.2f}")
     my_account.view_transaction_log()
 
     print("\n--- Notes on Encapsulation ---")
     print("`_balance` is 'protected' (by convention, accessible but shouldn't be modified directly).")
+    print("Here it is a read-only property over `_balance_cents`, so the amounts stay exact.")
     print("`__transaction_id_counter` and `__transaction_log` are 'private' (name-mangled by Python).")
     print(f"Accessing mangled counter: my_account._BankAccount__transaction_id_counter = {my_account._BankAccount__transaction_id_counter}")
 
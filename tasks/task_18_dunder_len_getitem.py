@@ -6,48 +6,512 @@ indexing (`obj[key]`), slicing (`obj[start:stop]`), and iteration.
 Let's create a 'WordCollection' that stores unique words.
 """
 
-class WordCollection:
+import concurrent.futures
+import mmap
+import multiprocessing
+import os
+import re
+import site
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from heapq import merge
+from itertools import accumulate, chain, groupby, islice
+
+BLOCK_SIZE = 1000 # Words per block; a block is split in two when it reaches twice this
+PRINT_LIMIT = 20 # Collections larger than this are summarized instead of printed in full
+CHUNK_SIZE = 4 << 20 # Bytes (or characters) of raw text per process-pool job in from_files / from_stream
+WORD_SEPARATORS = re.compile(r"[,\s]+") # Corpus words are separated by commas and/or whitespace
+
+# Saved collections (sorted string tables): header, the UTF-8 words back to back, padding to 8 bytes,
+# then len + 1 little-endian uint64 file positions (word i is the bytes between positions i and i + 1)
+SSTABLE_MAGIC = b"OOPSST01"
+SSTABLE_HEADER = struct.Struct("<8sQQ") # magic, word count, file position of the offsets
+
+
+def _locate(offsets, index): # (block number, index in block); offsets[b] = words up to the end of block b
+    b = bisect_right(offsets, index)
+    return b, index - (offsets[b - 1] if b else 0)
+
+def _iter_blocks(blocks, offsets, index, stop): # Words at positions index..stop-1, straight from the blocks
+    if index >= stop:
+        return
+    b, i = _locate(offsets, index)
+    words = chain(islice(blocks[b], i, None), chain.from_iterable(islice(blocks, b + 1, None)))
+    yield from islice(words, stop - index)
+
+
+# --- Building from large corpora: chunks are cleaned in a process pool, then merged as sorted runs
+def _chunk_words(chunk): # Pool job: raw text -> its unique, cleaned words, sorted
+    if isinstance(chunk, bytes):
+        chunk = chunk.decode("utf-8", errors="replace")
+    words = set(WORD_SEPARATORS.split(chunk.lower()))
+    words.discard("")
+    return sorted(words)
+
+def _file_chunks(paths, chunk_size):
+    for path in paths:
+        with open(path, "rb") as f:
+            carry = b""
+            while True:
+                block = f.read(chunk_size)
+                if not block:
+                    break
+                block = carry + block
+                cut = max(block.rfind(separator) for separator in (b",", b" ", b"\n", b"\t", b"\r")) # Never split a word
+                if cut < 0:
+                    carry = block
+                    continue
+                carry = block[cut + 1:]
+                yield block[:cut + 1]
+            if carry:
+                yield carry
+
+def _stream_chunks(texts, chunk_size):
+    batch, size = [], 0
+    for text in texts:
+        batch.append(text)
+        size += len(text)
+        if size >= chunk_size:
+            yield "\n".join(batch)
+            batch, size = [], 0
+    if batch:
+        yield "\n".join(batch)
+
+def _merge_runs(runs): # k-way merge of sorted runs, dropping duplicates
+    return [word for word, _ in groupby(merge(*runs))]
+
+def _push_run(runs, run):
+    # Keeps run sizes growing down the stack (like timsort's merge rule): each word takes part in
+    # O(log) merges, and since merged runs stop growing at the vocabulary size, so does memory
+    runs.append(run)
+    while len(runs) > 1 and len(runs[-2]) <= 2 * len(runs[-1]):
+        run = runs.pop()
+        runs[-1] = _merge_runs([runs[-1], run])
+
+def _unique_sorted_words(chunks, workers=None):
+    chunks = iter(chunks)
+    first_chunks = list(islice(chunks, 2))
+    chunks = chain(first_chunks, chunks)
+    workers = workers or os.cpu_count() or 1
+    # One chunk isn't worth starting a pool; and without a sys.modules entry (module loaded by path
+    # outside the task registry) workers could not find _chunk_words
+    runs = []
+    if workers == 1 or len(first_chunks) < 2 or getattr(sys.modules.get(__name__), "_chunk_words", None) is not _chunk_words:
+        for chunk in chunks:
+            _push_run(runs, _chunk_words(chunk))
+        return _merge_runs(runs)
+    # Spawned workers unpickle _chunk_words by importing this module by name, so each worker first
+    # puts this directory on its own sys.path (our sys.path is shared by every session's thread)
+    task_dir = os.path.dirname(os.path.abspath(__file__))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                                initializer=site.addsitedir, initargs=(task_dir,)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_chunk_words, chunk))
+            if len(pending) >= 2 * workers: # Bounded read-ahead: the raw corpus is never all in memory
+                _push_run(runs, pending.popleft().result())
+        while pending:
+            _push_run(runs, pending.popleft().result())
+    return _merge_runs(runs)
+
+
+class _BlockSnapshot:
+    # A WordCollection's blocks at the time a slice was taken (the collection copies them on write)
+    __slots__ = ("blocks", "offsets")
+
+    def __init__(self, blocks, offsets):
+        self.blocks = blocks
+        self.offsets = offsets
+
+    def _word_at(self, position):
+        b, i = _locate(self.offsets, position)
+        return self.blocks[b][i]
+
+    def _iter_range(self, start, stop):
+        return _iter_blocks(self.blocks, self.offsets, start, stop)
+
+
+class WordSlice:
+    """
+    A read-only view of positions of a WordCollection (or MappedWordCollection) that reads words
+    from its storage instead of copying them. The collection copies a block before changing it once
+    a view exists (copy-on-write), so a view keeps showing the words it was taken from, like a list slice.
+    """
+    __slots__ = ("_source", "_positions")
+
+    def __init__(self, source, positions):
+        self._source = source # Anything with _word_at(position) and _iter_range(start, stop)
+        self._positions = positions # A range of positions in the source
+
+    def _word_at(self, position):
+        return self._source._word_at(position)
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            try:
+                return self._word_at(self._positions[key])
+            except IndexError:
+                raise IndexError("WordSlice index out of range") from None
+        elif isinstance(key, slice):
+            return WordSlice(self._source, self._positions[key]) # Slicing a range is O(1)
+        else:
+            raise TypeError(f"WordSlice indices must be integers or slices, not {type(key).__name__}")
+
+    def __iter__(self):
+        positions = self._positions
+        if positions.step == 1:
+            return self._source._iter_range(positions.start, positions.stop)
+        return map(self._word_at, positions)
+
+    def __contains__(self, word): # Positions are in sorted (or reverse sorted) order: binary search
+        if not isinstance(word, str):
+            return False
+        word = word.strip().lower()
+        positions, lo, hi = self._positions, 0, len(self._positions)
+        ascending = positions.step > 0
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_word = self._word_at(positions[mid])
+            if mid_word < word if ascending else mid_word > word:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo < len(positions) and self._word_at(positions[lo]) == word
+
+    def to_list(self): # Materializes the view
+        return list(self)
+
+    def __eq__(self, other):
+        if isinstance(other, (WordSlice, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        if len(self) <= PRINT_LIMIT:
+            return f"WordSlice({self.to_list()})"
+        return f"WordSlice({len(self)} words, '{self[0]}' .. '{self[-1]}')"
+
+
+class _SortedWordQueries:
+    """
+    Autocomplete-style queries for sorted word storage. Subclasses provide _len, _rank(word)
+    (how many words sort before word) and _view(start, stop) (a WordSlice of those positions),
+    so each query is a couple of O(log n) rank lookups plus an O(1) view.
+    """
+
+    def with_prefix(self, prefix):
+        # Words starting with prefix sort from prefix up to the prefix with its last character bumped
+        # (after dropping trailing U+10FFFF, which can't be bumped)
+        prefix = prefix.strip().lower()
+        end_prefix = prefix.rstrip(chr(sys.maxunicode))
+        stop = self._rank(end_prefix[:-1] + chr(ord(end_prefix[-1]) + 1)) if end_prefix else self._len
+        return self._view(self._rank(prefix), stop)
+
+    def count_between(self, low, high): # Words w with low <= w <= high
+        low, high = low.strip().lower(), high.strip().lower()
+        if low > high:
+            return 0
+        return self._rank(high) + (high in self) - self._rank(low)
+
+    def nearest(self, word, k): # The k words closest to word's position in sorted order, in order
+        k = max(0, min(k, self._len))
+        start = min(max(self._rank(word.strip().lower()) - k // 2, 0), self._len - k)
+        return self._view(start, start + k)
+
+
+class MappedWordCollection(_SortedWordQueries):
+    """
+    A saved WordCollection opened through mmap (read-only). Words are decoded from the mapping only
+    when asked for, so opening takes the same time at any size and every process that opens the
+    file shares the operating system's single cached copy of it.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._len, offsets_at = SSTABLE_HEADER.unpack_from(self._mmap)
+        if magic != SSTABLE_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"'{os.path.basename(path)}' is not a saved WordCollection")
+        self._offsets_view = memoryview(self._mmap)[offsets_at:offsets_at + 8 * (self._len + 1)]
+        if sys.byteorder == "little":
+            self._offsets = self._offsets_view.cast("Q") # Zero-copy
+        else:
+            self._offsets = array("Q") # array("Q", view) would make one item per byte
+            self._offsets.frombytes(self._offsets_view)
+            self._offsets.byteswap()
+        print(f"Opened '{os.path.basename(path)}' ({self._len} words, memory-mapped).")
+
+    def _word_at(self, position):
+        return self._mmap[self._offsets[position]:self._offsets[position + 1]].decode("utf-8")
+
+    def _iter_range(self, start, stop):
+        return map(self._word_at, range(start, stop))
+
+    def _view(self, start, stop):
+        return WordSlice(self, range(start, stop))
+
+    def _rank_bytes(self, key): # Binary search on the raw bytes: UTF-8 byte order is the same as str order
+        mapping, offsets, lo, hi = self._mmap, self._offsets, 0, self._len
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if mapping[offsets[mid]:offsets[mid + 1]] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _rank(self, word):
+        return self._rank_bytes(word.encode("utf-8", "surrogatepass")) # Bumped prefixes may be surrogates
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            index = key + self._len if key < 0 else key
+            if not 0 <= index < self._len:
+                raise IndexError("MappedWordCollection index out of range")
+            return self._word_at(index)
+        elif isinstance(key, slice):
+            return WordSlice(self, range(*key.indices(self._len)))
+        else:
+            raise TypeError(f"MappedWordCollection indices must be integers or slices, not {type(key).__name__}")
+
+    def __iter__(self):
+        return self._iter_range(0, self._len)
+
+    def __contains__(self, word):
+        if not isinstance(word, str):
+            return False
+        key = word.strip().lower().encode("utf-8")
+        i = self._rank_bytes(key)
+        return i < self._len and self._mmap[self._offsets[i]:self._offsets[i + 1]] == key
+
+    def close(self):
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release() # The mapping can't close while views of it exist
+        self._offsets_view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self):
+        return f"MappedWordCollection({self._len} words)"
+
+
+class WordCollection(_SortedWordQueries):
     def __init__(self, initial_words_str=""):
-        # Store words in a set to ensure uniqueness, but convert to list for ordered access
-        # This is a bit of a simplification for demo; a truly ordered set might be better.
-        raw_words = [word.strip().lower() for word in initial_words_str.split(',') if word.strip()]
-        self._words = sorted(list(set(raw_words))) # Unique, sorted words
-        print(f"WordCollection created with words: {self._words}")
+        self._set_words([])
+        self._add_many(initial_words_str.split(','))
+        print(f"WordCollection created with words: {self._summary()}")
+
+    @classmethod
+    def from_files(cls, paths, workers=None, chunk_size=CHUNK_SIZE):
+        """
+        Builds a collection from UTF-8 text files whose words are separated by commas and/or whitespace.
+        Chunks are cleaned, de-duplicated and sorted in a process pool of `workers` (default: one per CPU)
+        and the sorted runs are merged, so memory follows the vocabulary, not the corpus.
+        """
+        paths = [paths] if isinstance(paths, (str, os.PathLike)) else list(paths)
+        return cls._from_chunks(_file_chunks(paths, chunk_size), workers, f"{len(paths)} file(s)")
+
+    @classmethod
+    def from_stream(cls, texts, workers=None, chunk_size=CHUNK_SIZE):
+        """
+        Like from_files, for an iterable of strings (lines, documents...); a word never spans two strings.
+        """
+        return cls._from_chunks(_stream_chunks(texts, chunk_size), workers, "a stream")
+
+    @classmethod
+    def _from_chunks(cls, chunks, workers, source):
+        collection = cls.__new__(cls)
+        collection._set_words(_unique_sorted_words(chunks, workers))
+        print(f"WordCollection built from {source} with words: {collection._summary()}")
+        return collection
+
+    def _set_words(self, words): # words must be sorted and unique
+        # Unique, sorted words kept in blocks (a "blocked sorted list"): inserting into a small block
+        # is cheap, and bisecting the blocks' last words finds the right block in O(log n)
+        self._blocks = [words[i:i + BLOCK_SIZE] for i in range(0, len(words), BLOCK_SIZE)] # Sorted, in order
+        self._maxes = [block[-1] for block in self._blocks] # Last word of each block
+        self._offsets = None # Words before the end of each block; rebuilt lazily after an insert
+        self._len = len(words)
+        # Copy-on-write state for WordSlice views: once a view holds self._blocks, the next change
+        # copies that list, and each block is copied the first time it is changed after that
+        self._shared = False
+        self._owned = None # ids of blocks created since the last view; None: every block is ours
+
+    def _summary(self):
+        if self._len <= PRINT_LIMIT:
+            return list(self._iter_from(0))
+        return f"{self._len} words, '{self._blocks[0][0]}' .. '{self._maxes[-1]}'"
+
+    def _own_block(self, b): # The block b, safe to change in place
+        block = self._blocks[b]
+        if self._owned is not None and id(block) not in self._owned:
+            block = self._blocks[b] = block[:]
+            self._owned.add(id(block))
+        return block
+
+    def _insert(self, word): # False if the word is already there
+        if self._shared:
+            self._blocks = self._blocks[:]
+            self._owned = set()
+            self._shared = False
+        if not self._blocks:
+            self._blocks.append([word])
+            self._maxes.append(word)
+        else:
+            b = bisect_left(self._maxes, word)
+            if b == len(self._maxes): # After every word: append to the last block
+                b -= 1
+                block = self._own_block(b)
+                block.append(word)
+                self._maxes[b] = word
+            else:
+                block = self._blocks[b]
+                i = bisect_left(block, word)
+                if block[i] == word:
+                    return False
+                block = self._own_block(b)
+                block.insert(i, word)
+            if len(block) >= 2 * BLOCK_SIZE:
+                halves = [block[:BLOCK_SIZE], block[BLOCK_SIZE:]]
+                self._blocks[b:b + 1] = halves
+                self._maxes.insert(b, block[BLOCK_SIZE - 1])
+                if self._owned is not None:
+                    self._owned.discard(id(block))
+                    self._owned.update(map(id, halves))
+        self._len += 1
+        self._offsets = None
+        return True
+
+    def _add_many(self, words): # Returns how many words were new
+        new_words = sorted({word.strip().lower() for word in words} - {""})
+        if len(new_words) * 16 < self._len: # A few words: insert them in place
+            return sum(self._insert(word) for word in new_words)
+        # Otherwise one merge pass over the old and new words; groupby drops the duplicates
+        words = _merge_runs([self._iter_from(0), new_words])
+        added = len(words) - self._len
+        self._set_words(words) # All new blocks: views of the old ones are unaffected
+        return added
+
+    def _block_offsets(self):
+        if self._offsets is None:
+            self._offsets = list(accumulate(map(len, self._blocks)))
+        return self._offsets
+
+    def _word_at(self, index):
+        b, i = _locate(self._block_offsets(), index)
+        return self._blocks[b][i]
+
+    def _rank(self, word):
+        b = bisect_left(self._maxes, word)
+        if b == len(self._maxes):
+            return self._len
+        return (self._block_offsets()[b - 1] if b else 0) + bisect_left(self._blocks[b], word)
+
+    def _view(self, start, stop):
+        self._shared = True # Copy-on-write from here on, as for slices
+        return WordSlice(_BlockSnapshot(self._blocks, self._block_offsets()), range(start, stop))
+
+    def _iter_from(self, index):
+        return _iter_blocks(self._blocks, self._block_offsets(), index, self._len)
 
     def add_word(self, new_word):
         new_word_clean = new_word.strip().lower()
-        if new_word_clean and new_word_clean not in self._words:
-            self._words.append(new_word_clean)
-            self._words.sort() # Keep it sorted
-            print(f"Added '{new_word_clean}'. Collection: {self._words}")
+        if new_word_clean and self._insert(new_word_clean):
+            print(f"Added '{new_word_clean}'. Collection: {self._summary()}")
         elif not new_word_clean:
             print("Cannot add empty word.")
         else:
             print(f"Word '{new_word_clean}' already in collection.")
 
+    def add_words(self, words):
+        """
+        Adds an iterable of words (cleaned like add_word) in one merge pass. Returns how many were new.
+        """
+        added = self._add_many(words)
+        print(f"Added {added} new words. Collection: {self._summary()}")
+        return added
+
+    def save(self, path):
+        """
+        Writes the words as an immutable sorted string table (see SSTABLE_HEADER), atomically.
+        Open it with MappedWordCollection(path).
+        """
+        offsets = array("Q", [SSTABLE_HEADER.size])
+        # Unique per call (sessions are threads of one process), in the target's directory so os.replace stays atomic
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=os.path.basename(path) + ".", suffix=".tmp")
+        try:
+            with open(fd, "wb") as f:
+                f.write(bytes(SSTABLE_HEADER.size)) # Filled in once the offsets' position is known
+                for block in self._blocks:
+                    encoded = [word.encode("utf-8") for word in block]
+                    f.write(b"".join(encoded))
+                    offsets.extend(islice(accumulate(map(len, encoded), initial=offsets[-1]), 1, None))
+                offsets_at = offsets[-1] + (-offsets[-1] % 8)
+                f.write(bytes(offsets_at - offsets[-1]))
+                if sys.byteorder == "big":
+                    offsets.byteswap()
+                offsets.tofile(f)
+                f.seek(0)
+                f.write(SSTABLE_HEADER.pack(SSTABLE_MAGIC, self._len, offsets_at))
+            os.chmod(temp_path, 0o644) # mkstemp creates it owner-only
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        print(f"Saved {self._len} words to '{os.path.basename(path)}'.")
+
+    def __contains__(self, word): # Binary search instead of scanning via __getitem__
+        if not isinstance(word, str) or not self._blocks:
+            return False
+        word = word.strip().lower()
+        b = bisect_left(self._maxes, word)
+        if b == len(self._maxes):
+            return False
+        block = self._blocks[b]
+        return block[bisect_left(block, word)] == word
+
     def __len__(self):
         print("WordCollection.__len__ called.")
-        return len(self._words)
+        return self._len
 
     def __getitem__(self, key):
         print(f"WordCollection.__getitem__ called with key: {key} (type: {type(key)})")
         if isinstance(key, int):
             # Basic positive/negative indexing
-            return self._words[key]
+            index = key + self._len if key < 0 else key
+            if not 0 <= index < self._len:
+                raise IndexError("WordCollection index out of range")
+            return self._word_at(index)
         elif isinstance(key, slice):
-            # Return a new WordCollection instance for slices to maintain type
-            # For simplicity, just returning the sliced list:
-            sliced_list = self._words[key]
-            print(f"  Sliced to: {sliced_list}")
-            return sliced_list # Or WordCollection(','.join(sliced_list))
+            # A WordSlice view over our blocks: no words are copied, whatever the slice's size
+            sliced_view = self._view(0, self._len)[key]
+            print(f"  Sliced to: {sliced_view}")
+            return sliced_view
         else:
             raise TypeError(f"WordCollection indices must be integers or slices, not {type(key).__name__}")
 
     def __str__(self):
-        return f"WordCollection({len(self._words)} words: {', '.join(self._words)})"
+        return f"WordCollection({self._len} words: {', '.join(self._iter_from(0))})"
 
     def __repr__(self):
-        return f"WordCollection(initial_words_str='{','.join(self._words)}')"
+        return f"WordCollection(initial_words_str='{','.join(self._iter_from(0))}')"
 
 
 def get_input_params():
@@ -97,7 +561,25 @@ def run_task(initial_str, word_to_add, index_to_get, slice_to_get):
     for word in my_collection: # This works due to __getitem__
         print(f"- {word}")
 
-    print(f"\nIs 'cherry' in collection? {'cherry' in my_collection}") # Works due to iteration
+    print(f"\nIs 'cherry' in collection? {'cherry' in my_collection}") # Uses __contains__ (binary search)
+
+    print("\n--- Building from a stream of text (large corpora: from_files / from_stream use a process pool) ---")
+    streamed = WordCollection.from_stream([initial_str, f"{word_to_add} {word_to_add.upper()}"], workers=1) # Tiny input: no pool
+    print(f"Streamed collection has {len(streamed)} words; 'fig' in it? {'fig' in streamed}")
+
+    print("\n--- Saving to a sorted string table and opening it with mmap ---")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        table_path = os.path.join(temp_dir, "words.sst")
+        my_collection.save(table_path)
+        with MappedWordCollection(table_path) as mapped:
+            print(f"Mapped: {len(mapped)} words, first '{mapped[0]}', last '{mapped[-1]}', slice [1:3] {mapped[1:3]}")
+            print(f"Is '{word_to_add}' in the mapped table? {word_to_add in mapped}")
+            print(f"Mapped words starting with '{word_to_add[:1]}': {mapped.with_prefix(word_to_add[:1])}")
+
+    print("\n--- Prefix and range queries (bisect bounds on the sorted words) ---")
+    print(f"Words starting with '{word_to_add[:1]}': {my_collection.with_prefix(word_to_add[:1])}")
+    print(f"Words between 'a' and 'm': {my_collection.count_between('a', 'm')}")
+    print(f"3 words nearest to '{word_to_add}': {my_collection.nearest(word_to_add, 3)}")
 
 if __name__ == "__main__":
     run_task("one,two,three,one", "four", 1, "0:2")
\ No newline at end of file
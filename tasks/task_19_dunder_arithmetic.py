@@ -5,6 +5,13 @@ Define how standard arithmetic operators (+, -, *, etc.) work with your
 custom objects by implementing methods like `__add__`, `__sub__`, `__mul__`.
 Let's create a 'Currency' class that supports addition and scalar multiplication.
 """
+import numbers
+import threading
+
+try:
+    import numpy as np # Only CurrencyArray needs NumPy; Currency works without it
+except ImportError:
+    np = None
 
 class Currency:
     def __init__(self, amount, unit="USD"):
@@ -57,6 +64,214 @@ class Currency:
             return self.amount == other.amount and self.unit == other.unit
         return False
 
+_unit_names = [] # Unit code -> unit, shared by every CurrencyArray
+_unit_codes = {} # Unit -> code
+_unit_lock = threading.Lock() # Two threads adding the same new unit must not get two codes
+MAX_UNIT_CODE = 65535 # Codes are stored as uint16
+
+def _unit_code(unit):
+    code = _unit_codes.get(unit)
+    if code is None:
+        with _unit_lock:
+            code = _unit_codes.get(unit)
+            if code is None:
+                if len(_unit_names) > MAX_UNIT_CODE:
+                    raise ValueError(f"Too many currency units: CurrencyArray supports at most {MAX_UNIT_CODE + 1:,} distinct units.")
+                _unit_names.append(unit)
+                code = _unit_codes[unit] = len(_unit_names) - 1
+    return code
+
+
+class CurrencyArray:
+    """
+    Many amounts at once: whole cents in one contiguous int64 NumPy array, with either one unit for
+    every amount or a column of small unit codes. +, -, scalar * and == work on all elements in one
+    vectorized step (no Currency object per element); mismatched units give NotImplemented like Currency.
+    """
+    __array_ufunc__ = None # ndarray + CurrencyArray defers to our __radd__ instead of looping over us
+
+    def __init__(self, amounts, unit="USD"):
+        if np is None:
+            raise ImportError("CurrencyArray needs NumPy (pip install numpy).")
+        cents = np.rint(np.asarray(amounts, dtype=np.float64) * 100).astype(np.int64)
+        if cents.ndim != 1:
+            raise ValueError(f"CurrencyArray amounts must be one-dimensional, not of shape {cents.shape}.")
+        if isinstance(unit, str):
+            self._set(cents, unit.upper(), None)
+        else:
+            units = np.asarray(unit, dtype=str)
+            if units.shape != cents.shape: # One unit per amount; a single shared unit is passed as a str
+                raise ValueError(f"CurrencyArray got {len(cents)} amounts but units of shape {units.shape}; "
+                                 "pass one unit per amount, or a single unit string.")
+            names, inverse = np.unique(np.char.upper(units), return_inverse=True)
+            if len(names) == 1:
+                self._set(cents, str(names[0]), None)
+            else:
+                lookup = np.array([_unit_code(str(name)) for name in names], dtype=np.uint16)
+                self._set(cents, None, lookup[inverse.reshape(-1)])
+        print(f"CurrencyArray created: {len(self)} amounts in {', '.join(self.units())}")
+
+    @classmethod
+    def from_cents(cls, cents, unit="USD"):
+        # Exact integer cents (no float rounding), one unit
+        cents = np.asarray(cents, dtype=np.int64)
+        if cents.ndim != 1:
+            raise ValueError(f"CurrencyArray amounts must be one-dimensional, not of shape {cents.shape}.")
+        array = cls.__new__(cls)
+        array._set(cents, unit.upper(), None)
+        return array
+
+    def _set(self, cents, unit, unit_codes):
+        self.cents = cents
+        self.unit = unit # The one unit of every amount, or None when unit_codes is used
+        self.unit_codes = unit_codes # uint16 code per amount (see _unit_names), or None
+
+    def _with_cents(self, cents): # Same units as self, new amounts
+        array = CurrencyArray.__new__(CurrencyArray)
+        array._set(cents, self.unit, self.unit_codes)
+        return array
+
+    def _codes(self):
+        if self.unit_codes is not None:
+            return self.unit_codes
+        return np.full(len(self.cents), _unit_code(self.unit), dtype=np.uint16)
+
+    def units(self): # The distinct units, sorted
+        if self.unit is not None:
+            return [self.unit]
+        return sorted(_unit_names[code] for code in np.unique(self.unit_codes))
+
+    def _check_length(self, other, verb):
+        if len(other) != len(self.cents):
+            raise ValueError(f"Cannot {verb} CurrencyArray of length {len(self.cents)} with {len(other)} amounts: lengths differ.")
+
+    def unit_mismatch(self, other):
+        """
+        Boolean mask of the positions whose unit differs from other's (a Currency or CurrencyArray).
+        """
+        if isinstance(other, Currency):
+            return self._codes() != _unit_code(other.unit)
+        self._check_length(other.cents, "compare")
+        if self.unit is not None and other.unit is not None:
+            return np.full(len(self.cents), self.unit != other.unit)
+        return self._codes() != other._codes()
+
+    def _units_match(self, other, verb):
+        other_unit = other.unit
+        if self.unit is not None and other_unit is not None: # One unit each side: no per-element check
+            if self.unit == other_unit:
+                return True
+            print(f"Error: Cannot {verb} different currency units ({self.unit} and {other_unit}) directly.")
+            return False
+        mismatch = self.unit_mismatch(other)
+        count = int(np.count_nonzero(mismatch))
+        if count:
+            print(f"Error: Cannot {verb} different currency units at {count} of {len(self.cents)} positions "
+                  f"(first at index {int(np.argmax(mismatch))}).")
+        return count == 0
+
+    def _other_cents(self, other, verb):
+        # other as cents that line up with self, or NotImplemented
+        if isinstance(other, CurrencyArray):
+            self._check_length(other.cents, verb)
+            return other.cents if self._units_match(other, verb) else NotImplemented
+        if isinstance(other, Currency):
+            return np.int64(round(other.amount * 100)) if self._units_match(other, verb) else NotImplemented
+        if isinstance(other, numbers.Real) or (isinstance(other, np.ndarray) and other.dtype.kind in "iuf"):
+            if np.ndim(other):
+                self._check_length(other, verb)
+            print(f"Warning: Using raw numbers with a CurrencyArray ({verb}). Assuming they are in its units.")
+            return np.rint(np.asarray(other, dtype=np.float64) * 100).astype(np.int64)
+        return NotImplemented
+
+    def __add__(self, other):
+        other_cents = self._other_cents(other, "add")
+        if other_cents is NotImplemented:
+            return NotImplemented
+        return self._with_cents(self.cents + other_cents)
+
+    __radd__ = __add__ # Addition is commutative
+
+    def __sub__(self, other):
+        other_cents = self._other_cents(other, "subtract")
+        if other_cents is NotImplemented:
+            return NotImplemented
+        return self._with_cents(self.cents - other_cents)
+
+    def __rsub__(self, other): # For other - self
+        other_cents = self._other_cents(other, "subtract")
+        if other_cents is NotImplemented:
+            return NotImplemented
+        return self._with_cents(other_cents - self.cents)
+
+    def __mul__(self, scalar):
+        if isinstance(scalar, numbers.Integral):
+            return self._with_cents(self.cents * int(scalar))
+        if isinstance(scalar, numbers.Real):
+            return self._with_cents(np.rint(self.cents * float(scalar)).astype(np.int64))
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other): # Elementwise, like NumPy: a boolean array
+        if isinstance(other, Currency):
+            return (self.cents == round(other.amount * 100)) & ~self.unit_mismatch(other)
+        if isinstance(other, CurrencyArray):
+            return ~self.unit_mismatch(other) & (self.cents == other.cents) # unit_mismatch checks the lengths first
+        return NotImplemented
+
+    __hash__ = None
+
+    # --- Reductions (one unit only; see sum_by_unit for mixed arrays)
+    def _single_unit(self, what):
+        if self.unit is None:
+            raise ValueError(f"Cannot take the {what} of mixed units {self.units()}; use sum_by_unit().")
+        return self.unit
+
+    def sum(self):
+        return Currency(int(self.cents.sum()) / 100, self._single_unit("sum"))
+
+    def mean(self):
+        return Currency(float(self.cents.mean()) / 100, self._single_unit("mean"))
+
+    def min(self):
+        return Currency(int(self.cents.min()) / 100, self._single_unit("min"))
+
+    def max(self):
+        return Currency(int(self.cents.max()) / 100, self._single_unit("max"))
+
+    def sum_by_unit(self): # {unit: Currency total}
+        if self.unit is not None:
+            return {self.unit: self.sum()}
+        codes = np.unique(self.unit_codes)
+        return {_unit_names[code]: Currency(int(self.cents[self.unit_codes == code].sum()) / 100, _unit_names[code])
+                for code in codes}
+
+    @property
+    def amounts(self): # float64 amounts (a new array)
+        return self.cents / 100
+
+    def __len__(self):
+        return len(self.cents)
+
+    def _unit_at(self, index):
+        return self.unit if self.unit is not None else _unit_names[self.unit_codes[index]]
+
+    def __getitem__(self, key):
+        if isinstance(key, numbers.Integral):
+            return Currency(int(self.cents[key]) / 100, self._unit_at(key))
+        array = CurrencyArray.__new__(CurrencyArray) # Slices and masks: NumPy views/copies of the columns
+        array._set(self.cents[key], self.unit, None if self.unit_codes is None else self.unit_codes[key])
+        return array
+
+    def __str__(self):
+        shown = ", ".join(f"{self.cents[i] / 100:.2f} {self._unit_at(i)}" for i in range(min(len(self), 5)))
+        return f"[{shown}{', ...' if len(self) > 5 else ''}]"
+
+    def __repr__(self):
+        return f"CurrencyArray({len(self)} amounts, units={self.units()})"
+
+
 def get_input_params():
     return [
         {"name": "amount1", "label": "Amount 1:", "type": "number_input", "default": 100.50, "step":0.01, "format":"%.2f"},
@@ -107,6 +322,22 @@ def run_task(amount1, unit1, amount2, unit2, scalar_val, raw_num_add):
     print(f"Is {c1} == {c2}? {c1 == c2}")
     print(f"Is {c1} == {c3}? {c1 == c3}")
 
+    print("\n--- Batched arithmetic with CurrencyArray (NumPy) ---")
+    if np is None:
+        print("NumPy is not installed; skipping the CurrencyArray demo.")
+        return
+    prices = CurrencyArray([amount1, amount1 * 2, amount1 * 3], unit1)
+    fees = CurrencyArray([amount2] * 3, unit2)
+    try:
+        total = prices + fees
+        print(f"Result: {prices} + {fees} = {total}, sum {total.sum()}")
+    except TypeError: # Both sides returned NotImplemented
+        print(f"Addition {prices!r} + {fees!r} is not supported (units differ).")
+    print(f"Scaled: {prices * scalar_val}")
+    mixed = CurrencyArray([amount1, amount2, amount1], [unit1, unit2, unit1])
+    print(f"Mixed units {mixed.units()}, totals: {', '.join(str(c) for c in mixed.sum_by_unit().values())}")
+    print(f"Unit mismatch vs {unit1}: {mixed.unit_mismatch(c1).tolist()}")
+
 if __name__ == "__main__":
     run_task(200.0, "EUR", 75.5, "EUR", 1.5, 20.0)
     run_task(100.0, "USD", 50.0, "CAD", 3.0, 5.0) # Test different units
\ No newline at end of file
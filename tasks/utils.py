@@ -1,24 +1,288 @@
+import collections
+import contextvars
+import inspect
 import io
+import queue
 import sys
-from contextlib import redirect_stdout
+import threading
+from contextlib import contextmanager
 
-def capture_output(func_to_run, *args, **kwargs):
+# Where print() output of the current thread/context should go (None = the real stdout)
+_output_target = contextvars.ContextVar("output_target", default=None)
+_router_install_lock = threading.Lock()
+
+class _StdoutRouter:
+    """
+    Installed once as sys.stdout. Each write goes to the target set by redirect_output()
+    in the writer's own context, so concurrent sessions never see each other's output.
+    """
+
+    def __init__(self, fallback):
+        self._fallback = fallback
+
+    def write(self, text):
+        target = _output_target.get()
+        if target is None:
+            target = self._fallback
+        return target.write(text) if target is not None else len(text)
+
+    def flush(self):
+        target = _output_target.get()
+        if target is None:
+            target = self._fallback
+        if target is not None:
+            target.flush()
+
+    def __getattr__(self, name): # encoding, fileno(), isatty(), ... come from the real stdout
+        return getattr(self._fallback, name)
+
+def install_output_router():
+    """
+    Replaces sys.stdout with the routing proxy, once per process. Safe to call repeatedly.
+    """
+    if isinstance(sys.stdout, _StdoutRouter):
+        return
+    with _router_install_lock:
+        if not isinstance(sys.stdout, _StdoutRouter):
+            sys.stdout = _StdoutRouter(sys.stdout)
+
+@contextmanager
+def redirect_output(target):
+    """
+    Sends print() output to `target` (any object with a write() method) inside the block.
+    Only affects the calling thread/context: other threads keep printing where they did.
+    Threads started inside the block print to the real stdout.
+    """
+    install_output_router()
+    token = _output_target.set(target)
+    try:
+        yield target
+    finally:
+        _output_target.reset(token) # Restored even if an error occurs
+
+# Global output budget; a task module can override it with its own OUTPUT_LIMITS dict.
+# max_lines may be None (no line limit); max_chars None means this default character limit,
+# since a line budget alone does not bound memory (output without newlines is a single line).
+DEFAULT_OUTPUT_LIMITS = {"max_chars": 200_000, "max_lines": 5_000}
+
+class BoundedOutput:
+    """
+    Text sink with a character and/or line budget.
+    Keeps the first half of the budget (head) and a ring buffer of the most recent half (tail),
+    counting whatever falls out in between, so memory stays bounded however much is written.
+    """
+
+    def __init__(self, max_chars=None, max_lines=None):
+        for name, limit in (("max_chars", max_chars), ("max_lines", max_lines)):
+            if limit is not None and (not isinstance(limit, int) or limit < 1):
+                raise ValueError(f"Output limit '{name}' must be a positive integer or None, not {limit!r}.")
+        if max_chars is None:
+            max_chars = DEFAULT_OUTPUT_LIMITS["max_chars"]
+        self.max_chars = max_chars
+        self.max_lines = max_lines
+        self._half_chars = max_chars // 2
+        self._half_lines = max_lines // 2 if max_lines is not None else None
+        self._head = []
+        self._head_chars = self._head_lines = 0
+        self._head_full = False
+        self._tail = collections.deque()
+        self._tail_chars = self._tail_lines = 0
+        self.dropped_chars = self.dropped_lines = 0
+
+    @classmethod
+    def from_limits(cls, limits=None):
+        return cls(**(DEFAULT_OUTPUT_LIMITS if limits is None else limits))
+
+    @property
+    def truncated(self):
+        return self.dropped_chars > 0 or self.dropped_lines > 0
+
+    def write(self, text):
+        start = 0
+        while start < len(text): # One piece per line, so line budgets can be enforced
+            end = text.find("\n", start) + 1 or len(text)
+            self._append(text[start:end])
+            start = end
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def _over(self, chars, lines):
+        return (chars > self._half_chars
+                or (self._half_lines is not None and lines > self._half_lines))
+
+    def _append(self, piece):
+        lines = 1 if piece.endswith("\n") else 0
+        if not self._head_full:
+            if not self._over(self._head_chars + len(piece), self._head_lines + lines):
+                self._head.append(piece)
+                self._head_chars += len(piece)
+                self._head_lines += lines
+                return
+            self._head_full = True # From now on everything goes through the tail ring buffer
+
+        self._tail.append(piece)
+        self._tail_chars += len(piece)
+        self._tail_lines += lines
+        while self._tail and self._over(self._tail_chars, self._tail_lines):
+            if len(self._tail) == 1 and self._tail_chars > self._half_chars:
+                # A single line longer than the whole character budget: keep its end
+                excess = self._tail_chars - self._half_chars
+                self._tail[0] = self._tail[0][excess:]
+                self._tail_chars -= excess
+                self.dropped_chars += excess
+                continue # Still over the line budget if it ends with a newline
+            oldest = self._tail.popleft()
+            self._tail_chars -= len(oldest)
+            self.dropped_chars += len(oldest)
+            if oldest.endswith("\n"):
+                self._tail_lines -= 1
+                self.dropped_lines += 1
+
+    def _truncation_marker(self):
+        return f"\n... [{self.dropped_chars:,} characters / {self.dropped_lines:,} lines truncated] ...\n"
+
+    def getvalue(self):
+        middle = self._truncation_marker() if self.truncated else ""
+        return "".join(self._head) + middle + "".join(self._tail)
+
+    def tail_text(self, max_chars):
+        """
+        Returns (at most) the last max_chars characters without joining the whole buffer.
+        """
+        pieces, size = [], 0
+        for piece in reversed(self._tail):
+            pieces.append(piece)
+            size += len(piece)
+            if size >= max_chars:
+                return "".join(reversed(pieces))[-max_chars:]
+        if self.truncated:
+            pieces.append(self._truncation_marker())
+        for piece in reversed(self._head):
+            pieces.append(piece)
+            size += len(piece)
+            if size >= max_chars:
+                break
+        return "".join(reversed(pieces))[-max_chars:]
+
+def capture_output(func_to_run, *args, output_limits=None, **kwargs):
     """
     Captures the print output of a function.
     Returns the captured output as a string.
+    Output beyond `output_limits` (default: DEFAULT_OUTPUT_LIMITS) is cut from the middle.
     """
-    captured_output = io.StringIO()
-    original_stdout = sys.stdout
-    try:
-        sys.stdout = captured_output
+    captured_output = BoundedOutput.from_limits(output_limits)
+    with redirect_output(captured_output):
         func_to_run(*args, **kwargs)
-    finally:
-        sys.stdout = original_stdout # Ensure stdout is restored even if an error occurs
     return captured_output.getvalue()
 
+
+class QueueWriter(io.TextIOBase):
+    """
+    File-like object that forwards written text to a queue in chunks.
+    A chunk is pushed once `max_chunk_chars` are pending, or at the latest after
+    `flush_interval` seconds, so a print is visible to the reader almost immediately
+    without paying one queue.put() per print() call.
+    """
+
+    def __init__(self, chunk_queue, flush_interval=0.05, max_chunk_chars=8192):
+        super().__init__()
+        self._queue = chunk_queue
+        self.flush_interval = flush_interval
+        self.max_chunk_chars = max_chunk_chars
+        self._pending = []
+        self._pending_chars = 0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._flusher.start()
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if not text:
+            return 0
+        with self._lock:
+            self._pending.append(text)
+            self._pending_chars += len(text)
+            if self._pending_chars >= self.max_chunk_chars:
+                self._push_pending()
+        return len(text)
+
+    def flush(self):
+        with self._lock:
+            self._push_pending()
+
+    def close(self):
+        self._stopped.set()
+        self.flush()
+        super().close()
+
+    def _push_pending(self): # Caller holds self._lock
+        if self._pending:
+            self._queue.put("".join(self._pending))
+            self._pending = []
+            self._pending_chars = 0
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(self.flush_interval):
+            self.flush()
+
+
+_STREAM_DONE = object()
+
+def stream_output(func_to_run, *args, **kwargs):
+    """
+    Runs a function in a background thread and yields its print output as it is produced.
+    If the function raises, the exception is re-raised after the last chunk.
+    """
+    chunk_queue = queue.Queue()
+    outcome = {}
+
+    def run():
+        writer = QueueWriter(chunk_queue)
+        try:
+            with redirect_output(writer):
+                func_to_run(*args, **kwargs)
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            writer.close()
+            chunk_queue.put(_STREAM_DONE)
+
+    threading.Thread(target=run, daemon=True).start()
+    while True:
+        chunk = chunk_queue.get()
+        if chunk is _STREAM_DONE:
+            break
+        yield chunk
+    if "error" in outcome:
+        raise outcome["error"]
+
+def build_task_args(run_function, user_inputs):
+    """
+    Returns the keyword arguments for run_task: its own defaults, overridden by
+    user_inputs, restricted to parameters run_task actually accepts.
+    """
+    sig = inspect.signature(run_function)
+    current_args_for_task = {
+        k: v.default for k, v in sig.parameters.items()
+        if v.default is not inspect.Parameter.empty
+    }
+    current_args_for_task.update(user_inputs) # User inputs override defaults
+    return {k: v for k, v in current_args_for_task.items() if k in sig.parameters}
+
+def default_inputs(input_params):
+    """
+    Maps each get_input_params() entry to its "default" value (what the form starts with).
+    """
+    return {param_info["name"]: param_info.get("default") for param_info in (input_params or [])}
+
 # Optional: Define input parameter types (if you added this from the later suggestion)
 class ParamType:
     TEXT = "text_input"
     NUMBER = "number_input"
     SELECTBOX = "selectbox"
-    # Add more as needed (slider, checkbox, etc.)
\ No newline at end of file
+    # Add more as needed (slider, checkbox, etc.)